@@ -26,7 +26,8 @@ class IncrementalScraper:
         self.exporter = JobExporter()
         self.logger = logging.getLogger(__name__)
         
-    def should_analyze_job(self, job_url: str, job_title: str, lookback_hours=24) -> Tuple[bool, str]:
+    def should_analyze_job(self, job_url: str, job_title: str, lookback_hours=24,
+                           seen_urls: Dict = None, now: datetime = None) -> Tuple[bool, str]:
         """
         Determine if a job needs analysis
         
@@ -34,12 +35,16 @@ class IncrementalScraper:
             job_url: Job URL
             job_title: Job title
             lookback_hours: Hours to look back for changes (default 24)
+            seen_urls: History 'seen_urls' map (loaded from disk if None)
+            now: Reference time (datetime.now() if None)
             
         Returns:
             Tuple of (should_analyze: bool, reason: str)
         """
-        history = self.exporter.load_job_history()
-        seen_urls = history.get('seen_urls', {})
+        if seen_urls is None:
+            seen_urls = self.exporter.load_job_history().get('seen_urls', {})
+        if now is None:
+            now = datetime.now()
         
         # New job never seen before
         if job_url not in seen_urls:
@@ -54,7 +59,7 @@ class IncrementalScraper:
         
         try:
             last_seen = datetime.strptime(last_seen_str, '%Y-%m-%d %H:%M:%S')
-            hours_since_seen = (datetime.now() - last_seen).total_seconds() / 3600
+            hours_since_seen = (now - last_seen).total_seconds() / 3600
             
             # Job not seen recently - re-analyze in case it changed
             if hours_since_seen > lookback_hours:
@@ -82,14 +87,16 @@ class IncrementalScraper:
         jobs_to_analyze = []
         jobs_to_skip = []
         
+        # History and clock are read once for the whole batch
         history = self.exporter.load_job_history()
         seen_urls = history.get('seen_urls', {})
+        now = datetime.now()
         
         for job in all_jobs:
             url = job.get('url', 'N/A')
             title = job.get('title', 'Unknown')
             
-            should_analyze, reason = self.should_analyze_job(url, title, lookback_hours)
+            should_analyze, reason = self.should_analyze_job(url, title, lookback_hours, seen_urls, now)
             
             # If reanalyze_cached is True, force analysis of all jobs seen within lookback
             if reanalyze_cached and not should_analyze and "within lookback" in reason:
@@ -124,8 +131,9 @@ class IncrementalScraper:
                 # Fields not available from listing pages
                 job['id'] = 'N/A'
                 job['category'] = 'N/A'
-                job['poster'] = 'N/A'
-                job['date_posted'] = 'N/A'
+                # Only some scrapers extract these
+                job.setdefault('poster', 'N/A')
+                job.setdefault('date_posted', 'N/A')
                 
                 jobs_to_skip.append(job)
                 
@@ -4,12 +4,23 @@ Supports JSON and CSV formats with incremental updates
 Enhanced with job history tracking
 """
 
-import json
 import csv
 import os
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import orjson
+
+try:
+    # Optional: vectorized CSV writer for large exports
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Exports with at least this many rows are written through polars (if installed)
+POLARS_CSV_MIN_ROWS = 500
+
 
 class JobExporter:
     """Handle exporting job analysis results to various formats"""
@@ -25,24 +36,33 @@ class JobExporter:
         self.output_dir.mkdir(exist_ok=True)
         
         # Generate timestamp for this export session
-        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # One clock reading, so both stamps name the same second
+        now = datetime.now()
+        self.timestamp = now.strftime('%Y%m%d_%H%M%S')
+        self.date_str = now.strftime('%Y-%m-%d %H:%M:%S')
         
         # History file path
         self.history_file = self.output_dir / 'job_history.json'
+        
+        # Exports may run concurrently; serialize read-modify-write of history
+        self._history_lock = threading.Lock()
     
     def load_job_history(self):
         """Load previously seen job IDs and URLs"""
         if self.history_file.exists():
             try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
+                with open(self.history_file, 'rb') as f:
+                    return orjson.loads(f.read())
+            except (orjson.JSONDecodeError, IOError):
                 return {'seen_urls': {}, 'last_update': None}
         return {'seen_urls': {}, 'last_update': None}
     
     def update_job_history(self, jobs):
         """Update history with new jobs"""
+        with self._history_lock:
+            return self._update_job_history(jobs)
+    
+    def _update_job_history(self, jobs):
         history = self.load_job_history()
         
         for job in jobs:
@@ -66,8 +86,9 @@ class JobExporter:
         history['last_update'] = self.date_str
         
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
+            # orjson writes the same bytes as json.dump(ensure_ascii=False, indent=2)
+            with open(self.history_file, 'wb') as f:
+                f.write(orjson.dumps(history, option=orjson.OPT_INDENT_2))
         except IOError as e:
             print(f"⚠️  Could not update history: {e}")
         
@@ -105,9 +126,10 @@ class JobExporter:
         
         return new_jobs
     
-    def get_history_stats(self):
-        """Get statistics about job history"""
-        history = self.load_job_history()
+    def get_history_stats(self, history=None):
+        """Get statistics about job history (loaded from disk if not given)"""
+        if history is None:
+            history = self.load_job_history()
         
         total_seen = len(history['seen_urls'])
         remote_seen = sum(1 for job in history['seen_urls'].values() if job.get('is_remote'))
@@ -118,7 +140,7 @@ class JobExporter:
             'last_update': history.get('last_update', 'Never')
         }
     
-    def export_to_json(self, jobs, stats, filename=None):
+    def export_to_json(self, jobs, stats, filename=None, update_history=True, history_stats=None):
         """
         Export job results to JSON format
         
@@ -126,6 +148,10 @@ class JobExporter:
             jobs: List of job dictionaries
             stats: Statistics dictionary
             filename: Custom filename (optional)
+            update_history: Record the jobs in the history first (False when
+                the caller already did, e.g. for a subset of an exported list)
+            history_stats: get_history_stats() result to embed, when the
+                caller already has it (skips reading the history again)
         
         Returns:
             Path to the exported file
@@ -135,9 +161,10 @@ class JobExporter:
         
         filepath = self.output_dir / filename
         
-        # Update history
-        self.update_job_history(jobs)
-        history_stats = self.get_history_stats()
+        # Update history (the updated history is returned, no need to reload it)
+        history = self.update_job_history(jobs) if update_history else None
+        if history_stats is None or history is not None:
+            history_stats = self.get_history_stats(history)
         
         export_data = {
             'metadata': {
@@ -150,8 +177,14 @@ class JobExporter:
             'jobs': jobs
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2, default=str)
+        # orjson encodes straight to UTF-8 bytes; datetimes are passed through
+        # to str() so the output matches the previous json.dump(default=str)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(
+                export_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME,
+                default=str
+            ))
         
         return filepath
     
@@ -193,33 +226,61 @@ class JobExporter:
             'url'
         ]
         
+        if pl is not None and len(jobs) >= POLARS_CSV_MIN_ROWS:
+            if self._write_csv_polars(filepath, fieldnames, jobs):
+                return filepath
+        
         with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for job in jobs:
-                # Prepare row data
-                row = {
-                    'id': job.get('id', 'N/A'),
-                    'title': job.get('title', 'N/A'),
-                    'location': job.get('location', 'N/A'),
-                    'category': job.get('category', 'N/A'),
-                    'price': job.get('price', 'N/A'),
-                    'poster': job.get('poster', 'N/A'),
-                    'date_posted': job.get('date_posted', 'N/A'),
-                    'classification': job.get('classification', 'N/A'),
-                    'confidence': job.get('confidence', 'N/A'),
-                    'is_remote': 'Yes' if job.get('is_remote', False) else 'No',
-                    'reasoning': job.get('reasoning', 'N/A'),
-                    'description_preview': job.get('description', 'N/A')[:200] + '...' if len(job.get('description', '')) > 200 else job.get('description', 'N/A'),
-                    'description_source': job.get('description_source', 'listing_page'),
-                    'was_reanalyzed': 'Yes' if job.get('was_reanalyzed', False) else 'No',
-                    'url': job.get('url', 'N/A')
-                }
-                writer.writerow(row)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            # Rows are plain tuples in fieldnames order: no per-row dict to
+            # build and re-key, and the C writer consumes them in one call
+            writer.writerows(self._csv_row(job) for job in jobs)
         
         return filepath
     
+    def _write_csv_polars(self, filepath, fieldnames, jobs):
+        """
+        Write the CSV with polars' native writer
+        
+        Produces the same bytes as the csv module path (BOM, CRLF, minimal
+        quoting). Returns False if the rows don't fit an all-text frame, so
+        the caller can fall back to csv.writer.
+        """
+        try:
+            frame = pl.DataFrame(
+                [self._csv_row(job) for job in jobs],
+                schema={name: pl.String for name in fieldnames},
+                orient='row'
+            )
+            frame.write_csv(filepath, include_bom=True, line_terminator='\r\n', quote_style='necessary')
+        except (pl.exceptions.PolarsError, TypeError, ValueError) as e:
+            print(f"⚠️  polars CSV export failed, using csv module: {e}")
+            return False
+        return True
+    
+    @staticmethod
+    def _csv_row(job):
+        """Build one CSV row (same column order as export_to_csv)"""
+        description = job.get('description', 'N/A')
+        return (
+            job.get('id', 'N/A'),
+            job.get('title', 'N/A'),
+            job.get('location', 'N/A'),
+            job.get('category', 'N/A'),
+            job.get('price', 'N/A'),
+            job.get('poster', 'N/A'),
+            job.get('date_posted', 'N/A'),
+            job.get('classification', 'N/A'),
+            job.get('confidence', 'N/A'),
+            'Yes' if job.get('is_remote', False) else 'No',
+            job.get('reasoning', 'N/A'),
+            description[:200] + '...' if len(description) > 200 else description,
+            job.get('description_source', 'listing_page'),
+            'Yes' if job.get('was_reanalyzed', False) else 'No',
+            job.get('url', 'N/A')
+        )
+    
     def update_latest_export(self, jobs, stats):
         """
         Update the 'latest' export files (always overwrites)
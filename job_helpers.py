@@ -3,20 +3,77 @@
 Job Description Fetcher - Retrieves full job descriptions from job pages
 """
 
-import requests
+import re
+from functools import lru_cache
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+from site_scrapers import create_session, declared_charset
+
+
+# Detail pages downloaded concurrently by JobDescriptionFetcher.fetch_many
+FETCH_WORKERS = 10
+
+# Fetched descriptions remembered per fetcher (oldest dropped first)
+DETAIL_CACHE_SIZE = 2_000
+
+# Distinct job texts whose pre-filter verdict is remembered per detector
+DETECTOR_CACHE_SIZE = 10_000
+
+# Site boilerplate dropped from article paragraphs (matched lowercase)
+GENERIC_PHRASES = ('soyez le premier', 'déposer un avis', 'sign in', 'log in')
+
+
+def keyword_trie_pattern(keywords):
+    """
+    Build a regex matching any of the keywords, factored by common prefix
+    
+    A flat 'a|b|c' alternation is tried keyword by keyword at every position
+    of the text; the trie form rejects most positions after a single
+    character test ('baby', 'baby-sitting' and 'babysitter' share one
+    'baby' branch with optional continuations). Like a longest-first
+    alternation, it reports the longest keyword at the leftmost match.
+    
+    Args:
+        keywords: Iterable of literal (already lowercased) keywords
+        
+    Returns:
+        str: Regex pattern
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = None  # end of a keyword
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = '|'.join(branches)
+        # A keyword ends here: the longer continuations are optional (greedy)
+        if '' in node:
+            return f'(?:{pattern})?'
+        return pattern if len(branches) == 1 else f'(?:{pattern})'
+    
+    return build(trie)
 
 
 class JobDescriptionFetcher:
     """Fetches full job descriptions from individual job pages"""
     
-    def __init__(self):
+    def __init__(self, pool_size=FETCH_WORKERS):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
         }
+        # Keep-alive connections shared by all detail page fetches
+        self.session = create_session(self.headers, pool_size=pool_size)
+        # Successful fetch_many results by URL, in insertion order
+        self._descriptions = {}
     
     def fetch_full_description(self, job_url):
         """
@@ -29,10 +86,10 @@ class JobDescriptionFetcher:
             str: Full description or empty string if failed
         """
         try:
-            response = requests.get(job_url, headers=self.headers, timeout=10)
+            response = self.session.get(job_url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml', from_encoding=declared_charset(response))
             
             # Find description in job page
             description = ''
@@ -105,9 +162,12 @@ class JobDescriptionFetcher:
                         
                         if unique_texts:
                             # Filter out generic messages like "Soyez le premier à déposer un avis"
-                            filtered = [t for t in unique_texts if not any(phrase in t.lower() for phrase in [
-                                'soyez le premier', 'déposer un avis', 'sign in', 'log in'
-                            ])]
+                            # (each paragraph is lowercased once, not once per phrase)
+                            filtered = []
+                            for paragraph_text in unique_texts:
+                                lowered = paragraph_text.lower()
+                                if not any(phrase in lowered for phrase in GENERIC_PHRASES):
+                                    filtered.append(paragraph_text)
                             description = ' '.join(filtered) if filtered else ' '.join(unique_texts)
             
             # Method 2: Look for description div
@@ -139,6 +199,38 @@ class JobDescriptionFetcher:
             print(f"    ⚠️ Failed to fetch full description: {e}")
             return ''
     
+    def fetch_many(self, job_urls, max_workers=FETCH_WORKERS):
+        """
+        Fetch several full descriptions concurrently
+        
+        Pages this fetcher already downloaded successfully are not fetched
+        again (failed ones are retried on the next call).
+        
+        Args:
+            job_urls: Iterable of job page URLs (duplicates are fetched once)
+            max_workers: Maximum concurrent requests
+            
+        Returns:
+            dict: {job_url: description}, '' for failed fetches
+        """
+        urls = list(dict.fromkeys(job_urls))
+        results = {url: self._descriptions[url] for url in urls if url in self._descriptions}
+        missing = [url for url in urls if url not in results]
+        if not missing:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            fetched = dict(zip(missing, pool.map(self.fetch_full_description, missing)))
+        results.update(fetched)
+        
+        for url, description in fetched.items():
+            if description:
+                self._descriptions[url] = description
+        while len(self._descriptions) > DETAIL_CACHE_SIZE:
+            del self._descriptions[next(iter(self._descriptions))]
+        
+        return results
+    
     def is_description_short(self, description, min_length=50):
         """Check if description is too short and needs full fetch"""
         return len(description) < min_length
@@ -185,6 +277,23 @@ class BasicRemoteDetector:
             'aide ménagère', 'femme de ménage', 'homme de ménage',
             'repasseuse', 'garde malade', 'aide à domicile'
         ]
+        
+        # Single prefix-trie pattern scanned once per job; reports the most
+        # specific keyword (e.g. 'babysitter' rather than 'baby')
+        self.onsite_pattern = re.compile(keyword_trie_pattern(self.obvious_onsite_keywords))
+        
+        # Reposted listings repeat the same text: scan each distinct one once
+        self._find_onsite_keyword = lru_cache(maxsize=DETECTOR_CACHE_SIZE)(self._scan_onsite_keyword)
+    
+    def _scan_onsite_keyword(self, text):
+        """Return the on-site keyword found in the lowercased text, or None"""
+        match = self.onsite_pattern.search(text)
+        return match.group(0) if match else None
+    
+    @property
+    def cache_hits(self):
+        """Number of detect_confidence calls answered from the cache"""
+        return self._find_onsite_keyword.cache_info().hits
     
     def detect_confidence(self, job_title, job_description, job_location):
         """
@@ -199,13 +308,13 @@ class BasicRemoteDetector:
         text = f"{job_title} {job_description} {job_location}".lower()
         
         # Check for OBVIOUS on-site work (physical presence required)
-        for keyword in self.obvious_onsite_keywords:
-            if keyword in text:
-                return {
-                    'is_remote': False,
-                    'confidence': 'HIGH',
-                    'reason': f"Obvious on-site work: {keyword}"
-                }
+        keyword = self._find_onsite_keyword(text)
+        if keyword:
+            return {
+                'is_remote': False,
+                'confidence': 'HIGH',
+                'reason': f"Obvious on-site work: {keyword}"
+            }
         
         # Everything else: uncertain, let LLM decide with context
         return {
@@ -3,8 +3,9 @@ Data Models with Pydantic Validation
 Ensures data quality and type safety throughout the scraper
 """
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
-from typing import Optional, Literal
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter, ValidationError, field_validator
+from typing import List, Optional, Literal, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 
 
@@ -76,6 +77,23 @@ class JobListing(BaseModel):
         }
 
 
+@dataclass(slots=True)
+class JobRecord:
+    """Lightweight per-job state carried between the analysis passes"""
+    
+    title: str
+    url: str
+    location: str
+    source: str
+    description: str
+    description_source: str = 'listing_page'
+    price: str = 'N/A'
+    poster: str = 'N/A'
+    date_posted: str = 'N/A'
+    basic_result: Optional[dict] = None
+    llm_key: Optional[str] = None  # job_cache_key of the text sent to the LLM
+
+
 class AnalysisResult(BaseModel):
     """LLM/NLP analysis result"""
     
@@ -94,28 +112,34 @@ class ScraperMetrics(BaseModel):
     """Scraper performance metrics"""
     
     timestamp: datetime = Field(default_factory=datetime.now)
-    duration_seconds: int = Field(..., ge=0)
+    duration_seconds: float = Field(..., ge=0)
     jobs_scraped: int = Field(..., ge=0)
     jobs_analyzed: int = Field(..., ge=0)
     new_jobs: int = Field(..., ge=0)
     cached_jobs: int = Field(..., ge=0)
     remote_jobs: int = Field(..., ge=0)
     llm_calls: int = Field(..., ge=0)
+    llm_tokens: int = Field(default=0, ge=0)
     cache_stats: dict
     confidence_distribution: dict
+    validation_errors: int = Field(default=0, ge=0)
+    duplicates_removed: int = Field(default=0, ge=0)
+    incremental_enabled: bool = True
+    sites_scraped: dict = Field(default_factory=dict)
     errors: list[str] = Field(default_factory=list)
     
     class Config:
         json_schema_extra = {
             "example": {
                 "timestamp": "2026-01-17T10:00:00",
-                "duration_seconds": 245,
+                "duration_seconds": 245.318,
                 "jobs_scraped": 200,
                 "jobs_analyzed": 80,
                 "new_jobs": 80,
                 "cached_jobs": 120,
                 "remote_jobs": 45,
                 "llm_calls": 80,
+                "llm_tokens": 96000,
                 "cache_stats": {
                     "cache_hits": 120,
                     "cache_misses": 80,
@@ -126,6 +150,10 @@ class ScraperMetrics(BaseModel):
                     "medium": 35,
                     "low": 15
                 },
+                "validation_errors": 0,
+                "duplicates_removed": 0,
+                "incremental_enabled": True,
+                "sites_scraped": {"jemepropose": 200},
                 "errors": []
             }
         }
@@ -171,6 +199,50 @@ def validate_job_data(job_data: dict) -> Optional[JobListing]:
         return None
 
 
+# Validates a whole list of jobs in one call into pydantic-core
+JOB_LIST_ADAPTER = TypeAdapter(List[JobListing])
+
+
+def validate_jobs(jobs: List[dict]) -> Tuple[List[dict], List[Tuple[int, Exception]]]:
+    """
+    Validate a batch of job dicts in a single pass
+    
+    Invalid jobs are kept unchanged (so nothing is dropped from the export)
+    and reported with their index.
+    
+    Args:
+        jobs: Raw job data dictionaries
+        
+    Returns:
+        Tuple of (job dicts, validated where possible; [(index, error), ...])
+    """
+    try:
+        return JOB_LIST_ADAPTER.dump_python(JOB_LIST_ADAPTER.validate_python(jobs)), []
+    except ValidationError as e:
+        # Each error's location starts with the list index of the failing job
+        invalid = {error['loc'][0] for error in e.errors() if error['loc']}
+    
+    # Validate the rest in a second batch, and only the failing jobs one by
+    # one (to report their own error)
+    valid_indices = [index for index in range(len(jobs)) if index not in invalid]
+    validated = list(jobs)
+    errors = []
+    try:
+        valid_jobs = JOB_LIST_ADAPTER.validate_python([jobs[i] for i in valid_indices])
+        for index, job in zip(valid_indices, JOB_LIST_ADAPTER.dump_python(valid_jobs)):
+            validated[index] = job
+    except ValidationError:
+        invalid = set(range(len(jobs)))
+    
+    for index in sorted(invalid):
+        try:
+            validated[index] = JobListing(**jobs[index]).model_dump()
+        except Exception as e:
+            errors.append((index, e))
+    
+    return validated, errors
+
+
 def validate_analysis_result(result: dict) -> Optional[AnalysisResult]:
     """
     Validate analysis result
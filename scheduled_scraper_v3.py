@@ -5,23 +5,46 @@ Supports multiple job platforms with incremental scraping and validation
 """
 
 import sys
-import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+# Re-encode the existing stream in place (block-buffered) rather than
+# stacking a second TextIOWrapper on top of sys.stdout.buffer
+sys.stdout.reconfigure(encoding='utf-8', line_buffering=False)
 
-from semantic_analyzer import SemanticJobAnalyzer, setup_logging
+from semantic_analyzer import SemanticJobAnalyzer, QuotaStore, setup_logging, job_cache_key, remove_legacy_cache_files, GROQ_MODELS, DEFAULT_MODEL_TIER
 from job_exporter import JobExporter
-from job_helpers import JobDescriptionFetcher, BasicRemoteDetector
+from job_helpers import JobDescriptionFetcher, BasicRemoteDetector, FETCH_WORKERS
 from incremental_scraper import IncrementalScraper
-from models import JobListing, validate_job_data, ScraperMetrics
-from site_scrapers import MultiSiteScraper, JeMeProposeScraper, MaltScraper, FreelanceComScraper, CometScraper, AlloVoisinsScraper
-import json
+from models import JobRecord, validate_jobs, ScraperMetrics
+from site_scrapers import PAGE_WORKERS, DEFAULT_MAX_PAGES_PER_SITE, MultiSiteScraper, JeMeProposeScraper, MaltScraper, FreelanceComScraper, CometScraper, AlloVoisinsScraper
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from functools import cache
 from datetime import datetime
+import time
 import logging
 import argparse
 
-# Free tier LLM quota (jobs per day)
+# Free tier LLM quota (jobs per day, shared by all runs of the day)
 DAILY_LLM_QUOTA = 1500
 
+# Concurrent LLM requests (kept low to stay under Groq rate limits)
+LLM_WORKERS = 4
+
+# Jobs classified per LLM request (instructions are sent once per batch)
+LLM_BATCH_SIZE = 10
+
+
+@cache
+def get_basic_detector():
+    """Shared keyword pre-filter (compiled pattern and verdict cache kept across runs)"""
+    return BasicRemoteDetector()
+
+
+@cache
+def get_description_fetcher(pool_size=FETCH_WORKERS):
+    """Shared detail page fetcher (keep-alive connections kept across runs)"""
+    return JobDescriptionFetcher(pool_size=pool_size)
+
 
 def scrape_multi_site(
     sites=['jemepropose'],
@@ -31,7 +54,10 @@ def scrape_multi_site(
     incremental=True,
     lookback_hours=24,
     llm_quota_per_site=None,
-    reanalyze_cached=False
+    reanalyze_cached=False,
+    fetch_workers=FETCH_WORKERS,
+    llm_workers=LLM_WORKERS,
+    model_tier=DEFAULT_MODEL_TIER
 ):
     """
     Multi-site job scraper with incremental support and intelligent quota management
@@ -40,28 +66,44 @@ def scrape_multi_site(
         sites: List of site names to scrape (['jemepropose', 'malt', 'freelance.com', 'comet'])
         use_llm: Whether to use Groq LLM
         verbose: Show detailed progress messages
-        max_pages: Maximum number of pages per site (None = unlimited, stops at quota)
+        max_pages: Maximum number of pages per site (None = DEFAULT_MAX_PAGES_PER_SITE,
+                   stops earlier at quota)
         incremental: Use incremental scraping
         lookback_hours: Hours to consider job as "recent"
-        llm_quota_per_site: LLM quota per site (None = auto-calculate from DAILY_LLM_QUOTA)
+        llm_quota_per_site: LLM quota per site (None = auto-calculate from what is left
+                            of DAILY_LLM_QUOTA today)
         reanalyze_cached: Force re-analysis of cached jobs with updated prompt
+                          (cached LLM verdicts are ignored and replaced)
+        fetch_workers: Concurrent detail page downloads
+        llm_workers: Concurrent LLM requests
+        model_tier: Groq model tier ('quality' or 'fast', see GROQ_MODELS)
     """
     logger = setup_logging(verbose)
     
-    # Calculate fair share quota per site
+    run_start = datetime.now()
+    run_ts = run_start.strftime('%Y-%m-%d %H:%M:%S')
+    # Monotonic clock for the duration; run_start stays as the wall-clock timestamp
+    run_clock = time.perf_counter()
+    
+    # Calculate fair share quota per site, from the part of today's Groq
+    # budget that earlier runs haven't spent
+    quota_store = QuotaStore() if use_llm else None
+    used_today = quota_store.usage_today()[0] if quota_store else 0
     if llm_quota_per_site is None:
-        llm_quota_per_site = DAILY_LLM_QUOTA // len(sites)
+        llm_quota_per_site = max(DAILY_LLM_QUOTA - used_today, 0) // len(sites)
     
     # Track metrics
     metrics = {
-        'start_time': datetime.now(),
+        'start_time': run_start,
         'jobs_scraped': 0,
         'jobs_analyzed': 0,
         'new_jobs': 0,
         'cached_jobs': 0,
         'llm_calls': 0,
+        'llm_tokens': 0,
         'cache_hits': 0,
         'validation_errors': 0,
+        'duplicates_removed': 0,
         'errors': [],
         'confidence_distribution': {'high': 0, 'medium': 0, 'low': 0},
         'sites_scraped': {},
@@ -69,14 +111,16 @@ def scrape_multi_site(
     
     if verbose:
         print(f"\n{'='*60}")
-        print(f"🚀 Starting MULTI-SITE job scraper - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"🚀 Starting MULTI-SITE job scraper - {run_ts}")
         print(f"🌐 Sites: {', '.join(sites)}")
         if max_pages:
             print(f"📄 Max {max_pages} pages per site")
         else:
-            print(f"📄 Default: 10 pages per site (quota applied after filtering)")
+            print(f"📄 Default: {DEFAULT_MAX_PAGES_PER_SITE} pages per site (quota applied after filtering)")
         print(f"🎯 LLM quota per site: {llm_quota_per_site} NEW jobs")
         print(f"🎯 Total LLM budget: {llm_quota_per_site * len(sites)} NEW jobs")
+        if used_today:
+            print(f"🎯 Already analyzed by the LLM today: {used_today}/{DAILY_LLM_QUOTA}")
         print(f"♻️  Incremental mode: {'ENABLED' if incremental else 'DISABLED'}")
         if incremental:
             print(f"🕐 Lookback: {lookback_hours}h")
@@ -97,9 +141,14 @@ def scrape_multi_site(
             'allovoisins': AlloVoisinsScraper,
         }
         
+        # Listing and detail pages live on the same hosts: the scrapers use the
+        # detail fetcher's session so its warm connections serve both phases
+        description_fetcher = get_description_fetcher(max(fetch_workers, PAGE_WORKERS))
+        
         for site_name in sites:
             if site_name in scraper_map:
-                multi_scraper.register_scraper(scraper_map[site_name](verbose=False))  # Turn off per-page verbosity
+                # Turn off per-page verbosity
+                multi_scraper.register_scraper(scraper_map[site_name](verbose=False, session=description_fetcher.session))
             else:
                 logger.warning(f"Unknown site: {site_name}")
         
@@ -118,6 +167,19 @@ def scrape_multi_site(
             else:
                 return jobs, []  # All jobs are new if no incremental
         
+        # The quota is an LLM budget: NEW jobs the keyword pre-filter already
+        # settles (obvious on-site work) are kept without spending it
+        basic_detector = get_basic_detector()
+        detector_hits_before = basic_detector.cache_hits
+        # Verdicts by (title, description, location), reused in Phase 3 so
+        # the detector's cache hits only count genuinely repeated texts
+        quota_verdicts = {}
+        
+        def needs_llm(job):
+            text = (job['title'], job['description'], job['location'])
+            verdict = quota_verdicts[text] = basic_detector.detect_confidence(*text)
+            return verdict['confidence'] == 'LOW'
+        
         # Scrape with intelligent quota management
         total_daily_quota = llm_quota_per_site * len(sites)
         scraped_jobs, jobs_to_analyze, jobs_from_cache, quota_used = multi_scraper.scrape_with_incremental_quota(
@@ -125,37 +187,54 @@ def scrape_multi_site(
             enabled_sites=sites,
             max_pages_per_site=max_pages,
             incremental_filter_callback=incremental_filter_callback if incremental else None,
-            lookback_hours=lookback_hours
+            lookback_hours=lookback_hours,
+            quota_cost=needs_llm
         )
         
         metrics['jobs_scraped'] = len(scraped_jobs)
         metrics['new_jobs'] = len(jobs_to_analyze)
         metrics['cached_jobs'] = len(jobs_from_cache)
+        metrics['duplicates_removed'] = multi_scraper.duplicates_removed
         
-        # Track per-site statistics
+        # Track per-site statistics (one pass over the jobs, every site listed)
+        site_counts = Counter(job.get('source') for job in scraped_jobs)
         for site in sites:
-            site_jobs = [j for j in scraped_jobs if j.get('source') == site]
-            metrics['sites_scraped'][site] = len(site_jobs)
+            metrics['sites_scraped'][site] = site_counts[site]
         
         # ===== PHASE 3: ANALYZE JOBS =====
         if verbose:
             print(f"\n🔍 Phase 3: Analyzing {len(jobs_to_analyze)} jobs...")
         
-        # Initialize analyzers
-        basic_detector = BasicRemoteDetector()
-        description_fetcher = JobDescriptionFetcher()
-        llm_analyzer = SemanticJobAnalyzer(use_groq=use_llm, verbose=verbose)
+        # Initialize the LLM analyzer (per run: it keeps per-run stats)
+        llm_analyzer = SemanticJobAnalyzer(use_groq=use_llm, verbose=verbose, model_tier=model_tier)
         
         stats = {
             'analyzed_with_llm': 0,
+            'llm_duplicates_skipped': 0,
             'full_description_fetched': 0,
-            'high_confidence_skip': 0
+            'high_confidence_skip': 0,
+            'detector_cache_hits': 0
         }
         
         all_jobs = []
-        remote_count = 0
+        remote_jobs = []  # Filled as the remote decisions are made
+        remote_positions = []
+        
+        # Pass 1: complete short descriptions and run the cheap keyword detector.
+        # Detail pages are I/O-bound, so they are fetched concurrently in two
+        # batches: missing/short listing descriptions up front, then the LOW
+        # confidence jobs whose text is still too thin for the LLM
+        def needs_detail(job_url, description, min_length):
+            return job_url != 'N/A' and (description == 'N/A' or len(description) < min_length)
         
-        # Process jobs to analyze
+        detail_pages = description_fetcher.fetch_many(
+            (job['url'] for job in jobs_to_analyze if needs_detail(job['url'], job['description'], 50)),
+            max_workers=fetch_workers
+        )
+        
+        pending = []
+        needs_more_text = []
+        llm_ready = []  # LOW jobs whose text won't change before the LLM
         for idx, job_data in enumerate(jobs_to_analyze, 1):
             if verbose and idx <= 3:  # Show first 3 jobs
                 print(f"\n[{idx}/{len(jobs_to_analyze)}] {job_data['title'][:50]}... ({job_data['source']})")
@@ -163,72 +242,132 @@ def scrape_multi_site(
             job_title = job_data['title']
             job_description = job_data['description']
             job_location = job_data['location']
-            job_price = job_data.get('price', 'N/A')
             job_url = job_data['url']
-            job_source = job_data['source']
             
             # Try to get a better description upfront if listing description is missing or short
-            if job_description == 'N/A' or len(job_description) < 50:
-                if job_url != 'N/A':
-                    better_desc = description_fetcher.fetch_full_description(job_url)
-                    if better_desc and len(better_desc) > len(job_description):
-                        job_description = better_desc  # REPLACE, don't append
-                        stats['full_description_fetched'] += 1
+            if needs_detail(job_url, job_description, 50):
+                better_desc = detail_pages.get(job_url, '')
+                if better_desc and len(better_desc) > len(job_description):
+                    job_description = better_desc  # REPLACE, don't append
+                    stats['full_description_fetched'] += 1
             
-            # Basic detection
-            basic_result = basic_detector.detect_confidence(job_title, job_description, job_location)
+            # Basic detection, already done at quota time on the listing text.
+            # A job that was free then stays free (its LLM call was never
+            # budgeted); a LOW one is re-checked if the description was replaced
+            basic_result = quota_verdicts.get((job_title, job_data['description'], job_location))
+            if basic_result is None or (basic_result['confidence'] == 'LOW' and job_description != job_data['description']):
+                basic_result = basic_detector.detect_confidence(job_title, job_description, job_location)
             
             # Track which description we'll use for export
-            final_description = job_description
             description_source = 'listing_page' if job_description == job_data.get('description', 'N/A') else 'detail_page'
             
-            # Analyze based on confidence
+            record = JobRecord(
+                title=job_title,
+                url=job_url,
+                location=job_location,
+                source=job_data['source'],
+                description=job_description,
+                description_source=description_source,
+                price=job_data.get('price', 'N/A'),
+                poster=job_data.get('poster', 'N/A'),
+                date_posted=job_data.get('date_posted', 'N/A'),
+                basic_result=basic_result,
+            )
+            
             if basic_result['confidence'] == 'LOW':
-                # Fetch full description if still needed
-                full_description = job_description
-                if job_url != 'N/A' and (job_description == 'N/A' or len(job_description) < 100):
-                    better_desc = description_fetcher.fetch_full_description(job_url)
-                    if better_desc and len(better_desc) > len(job_description):
-                        full_description = better_desc  # REPLACE the short description
-                        final_description = better_desc  # Use full description for export
-                        description_source = 'detail_page'
-                        stats['full_description_fetched'] += 1
-                
-                # Analyze with LLM
-                analysis = llm_analyzer.analyze_with_groq(job_title, full_description, job_location, job_price)
-                
-                # Use analysis result
+                # Reposted listings often share title/description/location
+                # (up to case/spacing): the LLM sees each distinct one once
+                record.llm_key = job_cache_key(job_title, job_description, job_location)
+                if needs_detail(job_url, job_description, 100):
+                    needs_more_text.append(record)
+                else:
+                    llm_ready.append(record)
+            else:
+                # High confidence - skip LLM
+                stats['high_confidence_skip'] += 1
+            
+            pending.append(record)
+        
+        stats['detector_cache_hits'] = basic_detector.cache_hits - detector_hits_before
+        
+        # Pass 2: LLM analysis in batches of LLM_BATCH_SIZE jobs per prompt,
+        # through a fixed pool of workers so at most llm_workers requests are
+        # in flight and 429 retries don't pile up. Jobs whose text is final
+        # go first, so their batches run while the remaining LOW jobs'
+        # detail pages are downloaded
+        llm_inputs = {}
+        llm_batches = []  # (llm_keys, future of their analyses)
+        
+        def submit_llm(records):
+            new_inputs = {}
+            for record in records:
+                if record.llm_key is not None and record.llm_key not in llm_inputs:
+                    llm_inputs[record.llm_key] = new_inputs[record.llm_key] = (
+                        record.title, record.description, record.location, record.price
+                    )
+            keys = list(new_inputs)
+            for i in range(0, len(keys), LLM_BATCH_SIZE):
+                batch_keys = keys[i:i + LLM_BATCH_SIZE]
+                batch = [new_inputs[key] for key in batch_keys]
+                llm_batches.append((batch_keys, llm_pool.submit(
+                    llm_analyzer.analyze_batch_with_groq, batch, bypass_cache=reanalyze_cached
+                )))
+        
+        with ThreadPoolExecutor(max_workers=llm_workers) as llm_pool:
+            submit_llm(llm_ready)
+            
+            # Second batch for LOW jobs; pages already fetched above are reused
+            detail_pages.update(description_fetcher.fetch_many(
+                (record.url for record in needs_more_text if record.url not in detail_pages),
+                max_workers=fetch_workers
+            ))
+            for record in needs_more_text:
+                better_desc = detail_pages.get(record.url, '')
+                if better_desc and len(better_desc) > len(record.description):
+                    record.description = better_desc  # REPLACE the short description
+                    record.description_source = 'detail_page'
+                    record.llm_key = job_cache_key(record.title, better_desc, record.location)
+                    stats['full_description_fetched'] += 1
+            
+            submit_llm(needs_more_text)
+            
+            llm_results = {}
+            for batch_keys, future in llm_batches:
+                llm_results.update(zip(batch_keys, future.result()))
+        
+        stats['analyzed_with_llm'] = len(llm_results)
+        stats['llm_duplicates_skipped'] = sum(1 for record in pending if record.llm_key is not None) - len(llm_results)
+        metrics['llm_calls'] = len(llm_results)
+        metrics['llm_tokens'] = llm_analyzer.tokens_used
+        if quota_store:
+            quota_store.record(llm_analyzer.jobs_analyzed_by_groq, llm_analyzer.tokens_used)
+        
+        # Pass 3: build and count the job objects, then validate them in one batch
+        job_objects = []
+        for record in pending:
+            if record.llm_key is not None:
+                analysis = llm_results[record.llm_key]
                 result = {
                     'is_remote': analysis.get('is_remote', False),
                     'confidence_score': analysis.get('remote_confidence', 0.5),
                     'reason': analysis.get('reason', 'LLM analysis'),
                     'confidence': 'HIGH' if analysis.get('remote_confidence', 0) > 0.8 else 'MEDIUM'
                 }
-                
-                stats['analyzed_with_llm'] += 1
-                metrics['llm_calls'] += 1
             else:
-                # High confidence - skip LLM
-                result = basic_result
-                stats['high_confidence_skip'] += 1
-            
-            # Track confidence distribution
-            confidence_level = result.get('confidence', 'MEDIUM').lower()
-            if confidence_level in metrics['confidence_distribution']:
-                metrics['confidence_distribution'][confidence_level] += 1
+                result = record.basic_result
             
             # Create job object with all required fields
             job_object = {
                 'id': 'N/A',  # Not available from listing pages
-                'title': job_title,
-                'description': final_description,  # Use the better description if fetched
-                'url': job_url,
-                'location': job_location,
+                'title': record.title,
+                'description': record.description,  # Use the better description if fetched
+                'url': record.url,
+                'location': record.location,
                 'category': 'N/A',  # Not available from listing pages
-                'price': job_price,
-                'poster': 'N/A',  # Not available from listing pages
-                'date_posted': 'N/A',  # Not available from listing pages
-                'source': job_source,
+                'price': record.price,
+                'poster': record.poster,
+                'date_posted': record.date_posted,
+                'source': record.source,
                 'is_remote': result['is_remote'],
                 'remote_confidence': result.get('confidence_score', 0.8 if result['confidence'] == 'HIGH' else 0.5),
                 'reason': result['reason'],
@@ -236,55 +375,64 @@ def scrape_multi_site(
                 'confidence': result.get('confidence', 'MEDIUM'),
                 'reasoning': result['reason'],
                 'classification': 'remote' if result['is_remote'] else 'on-site',
-                'description_source': description_source,
+                'description_source': record.description_source,
                 'was_reanalyzed': False  # Only true if we re-analyze an existing job
             }
             
-            # Validate with Pydantic
-            try:
-                validated_job = JobListing(**job_object)
-                all_jobs.append(validated_job.model_dump())
-            except Exception as e:
-                logger.warning(f"Validation error for job: {e}")
-                all_jobs.append(job_object)
-                metrics['validation_errors'] += 1
-            
             if result['is_remote']:
-                remote_count += 1
-            
-            metrics['jobs_analyzed'] += 1
+                remote_positions.append(len(job_objects))
+            job_objects.append(job_object)
+        
+        # Counts are taken once over the built objects
+        metrics['jobs_analyzed'] += len(job_objects)
+        confidence_levels = Counter(job['confidence'].lower() for job in job_objects)
+        for level in metrics['confidence_distribution']:
+            metrics['confidence_distribution'][level] += confidence_levels[level]
+        
+        # Validate with Pydantic (invalid jobs are kept as built)
+        validated_jobs, validation_errors = validate_jobs(job_objects)
+        for _, e in validation_errors:
+            logger.warning(f"Validation error for job: {e}")
+        metrics['validation_errors'] += len(validation_errors)
+        all_jobs.extend(validated_jobs)
+        remote_jobs.extend(validated_jobs[position] for position in remote_positions)
         
         # Add cached jobs to results
         all_jobs.extend(jobs_from_cache)
-        if jobs_from_cache:
-            # Count remote jobs from cache
-            remote_count += sum(1 for job in jobs_from_cache if job.get('is_remote'))
+        remote_jobs.extend(job for job in jobs_from_cache if job.get('is_remote'))
+        remote_count = len(remote_jobs)
         
         logger.info(f"Analysis complete - Total: {len(all_jobs)}, Remote: {remote_count}")
         
         # ===== PHASE 4: EXPORT =====
         if verbose:
-            print(f"\n{'='*60}")
-            print(f"✅ Analysis complete!")
-            print(f"   Total jobs: {len(all_jobs)}")
-            print(f"   New/changed jobs analyzed: {len(jobs_to_analyze)}")
-            print(f"   Jobs from cache: {len(jobs_from_cache)}")
-            print(f"   Remote jobs: {remote_count}")
-            print(f"   Remote percentage: {round(remote_count / len(all_jobs) * 100, 1) if all_jobs else 0}%")
-            print(f"   📊 Stats:")
-            print(f"      - Analyzed with LLM: {stats['analyzed_with_llm']}")
-            print(f"      - High confidence skip: {stats['high_confidence_skip']}")
-            print(f"      - Full descriptions fetched: {stats['full_description_fetched']}")
+            # Build the summary first and emit it with a single write
+            summary = [
+                f"\n{'='*60}",
+                f"✅ Analysis complete!",
+                f"   Total jobs: {len(all_jobs)}",
+                f"   New/changed jobs analyzed: {len(jobs_to_analyze)}",
+                f"   Jobs from cache: {len(jobs_from_cache)}",
+                f"   Remote jobs: {remote_count}",
+                f"   Remote percentage: {round(remote_count / len(all_jobs) * 100, 1) if all_jobs else 0}%",
+                f"   📊 Stats:",
+                f"      - Analyzed with LLM: {stats['analyzed_with_llm']}",
+                f"      - Duplicate listings reused: {stats['llm_duplicates_skipped']}",
+                f"      - High confidence skip: {stats['high_confidence_skip']}",
+                f"      - Repeated texts pre-filtered from cache: {stats['detector_cache_hits']}",
+                f"      - Full descriptions fetched: {stats['full_description_fetched']}",
+            ]
             if incremental:
-                print(f"      - Incremental reduction: {metrics['cached_jobs']}/{len(all_jobs)} ({round(metrics['cached_jobs']/len(all_jobs)*100, 1) if all_jobs else 0}%)")
+                summary.append(f"      - Incremental reduction: {metrics['cached_jobs']}/{len(all_jobs)} ({round(metrics['cached_jobs']/len(all_jobs)*100, 1) if all_jobs else 0}%)")
             if metrics['validation_errors'] > 0:
-                print(f"      ⚠️  Validation errors: {metrics['validation_errors']}")
-            print(f"{'='*60}\n")
+                summary.append(f"      ⚠️  Validation errors: {metrics['validation_errors']}")
+            summary.append(f"{'='*60}\n")
+            print('\n'.join(summary))
         
         # Export metrics
         cache_stats = llm_analyzer.get_cache_stats()
         metrics['cache_hits'] = cache_stats.get('cache_hits', 0)
-        duration = (datetime.now() - metrics['start_time']).seconds
+        duration = round(time.perf_counter() - run_clock, 3)
         
         metrics_export = {
             'timestamp': metrics['start_time'].isoformat(),
@@ -295,34 +443,43 @@ def scrape_multi_site(
             'cached_jobs': metrics['cached_jobs'],
             'remote_jobs': remote_count,
             'llm_calls': metrics['llm_calls'],
+            'llm_tokens': metrics['llm_tokens'],
             'cache_stats': cache_stats,
             'confidence_distribution': metrics['confidence_distribution'],
             'validation_errors': metrics['validation_errors'],
+            'duplicates_removed': metrics['duplicates_removed'],
             'incremental_enabled': incremental,
             'sites_scraped': metrics['sites_scraped'],
             'errors': metrics['errors']
         }
         
-        # Validate and export metrics
+        # Validate and export metrics (the dict above is already in its
+        # JSON shape, so it is checked but not re-dumped through the model)
         try:
-            validated_metrics = ScraperMetrics(**metrics_export)
-            metrics_export = validated_metrics.model_dump()
+            ScraperMetrics.model_validate(metrics_export)
             logger.info("Metrics validated successfully")
         except Exception as e:
             logger.warning(f"Metrics validation failed: {e}")
         
-        try:
-            with open('exports/metrics_latest.json', 'w', encoding='utf-8') as f:
-                json.dump(metrics_export, f, indent=2, ensure_ascii=False, default=str)
-            logger.info("Metrics exported successfully")
-        except Exception as e:
-            logger.error(f"Failed to export metrics: {e}")
+        def export_metrics():
+            try:
+                # Same bytes as json.dump(indent=2, ensure_ascii=False, default=str)
+                with open('exports/metrics_latest.json', 'wb') as f:
+                    f.write(orjson.dumps(
+                        metrics_export,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME,
+                        default=str
+                    ))
+                logger.info("Metrics exported successfully")
+            except Exception as e:
+                logger.error(f"Failed to export metrics: {e}")
         
         # Export jobs
         if verbose:
             print("💾 Exporting results...")
         
         exporter = JobExporter()
+        export_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         stats_all = {
             'total': len(all_jobs),
@@ -332,11 +489,9 @@ def scrape_multi_site(
             'llm_used': use_llm,
             'incremental_enabled': incremental,
             'sites': list(metrics['sites_scraped'].keys()),
-            'export_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'export_date': export_date
         }
         
-        remote_jobs = [job for job in all_jobs if job['is_remote']]
-        
         stats_remote = {
             'total': len(remote_jobs),
             'remote': len(remote_jobs),
@@ -344,14 +499,26 @@ def scrape_multi_site(
             'remote_percentage': 100.0,
             'llm_used': use_llm,
             'sites': list(metrics['sites_scraped'].keys()),
-            'export_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'export_date': export_date
         }
         
-        # Export
-        json_all = exporter.export_to_json(all_jobs, stats_all, filename='jobs_latest.json')
-        csv_all = exporter.export_to_csv(all_jobs, filename='jobs_latest.csv')
-        json_remote = exporter.export_to_json(remote_jobs, stats_remote, filename='remote_jobs_latest.json')
-        csv_remote = exporter.export_to_csv(remote_jobs, filename='remote_jobs_latest.csv')
+        # Record this run in the job history once (remote_jobs is a subset of
+        # all_jobs) and summarize it once for both JSON files, then write the
+        # files concurrently
+        history_stats = exporter.get_history_stats(exporter.update_job_history(all_jobs))
+        
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            metrics_future = pool.submit(export_metrics)
+            futures = [
+                pool.submit(exporter.export_to_json, all_jobs, stats_all, filename='jobs_latest.json',
+                            update_history=False, history_stats=history_stats),
+                pool.submit(exporter.export_to_csv, all_jobs, filename='jobs_latest.csv'),
+                pool.submit(exporter.export_to_json, remote_jobs, stats_remote, filename='remote_jobs_latest.json',
+                            update_history=False, history_stats=history_stats),
+                pool.submit(exporter.export_to_csv, remote_jobs, filename='remote_jobs_latest.csv'),
+            ]
+            json_all, csv_all, json_remote, csv_remote = [f.result() for f in futures]
+            metrics_future.result()
         
         if verbose:
             print(f"\n💾 Exported to:")
@@ -386,14 +553,22 @@ def scrape_multi_site(
 
 
 if __name__ == '__main__':
+    # Local runs: pick up GROQ_API_KEY etc. from a .env file if python-dotenv
+    # is installed (variables already in the environment take precedence)
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(override=False)
+    except ImportError:
+        pass
+    
     parser = argparse.ArgumentParser(description='Multi-Site Job Scraper with Intelligent Quota Management')
     parser.add_argument('--sites', nargs='+', default=['jemepropose'],
                        choices=['jemepropose', 'malt', 'freelance.com', 'comet', 'allovoisins'],
                        help='Sites to scrape (default: jemepropose)')
     parser.add_argument('--pages', type=int, default=None,
-                       help='Max pages per site (default: None = unlimited, stops at quota)')
+                       help=f'Max pages per site (default: {DEFAULT_MAX_PAGES_PER_SITE}, stops earlier at quota)')
     parser.add_argument('--quota', type=int, default=None,
-                       help=f'LLM quota per site (default: {DAILY_LLM_QUOTA} / num_sites)')
+                       help=f'LLM quota per site (default: what is left of {DAILY_LLM_QUOTA} today / num_sites)')
     parser.add_argument('--no-llm', action='store_true',
                        help='Disable LLM analysis (use NLP only)')
     parser.add_argument('--verbose', action='store_true',
@@ -404,9 +579,19 @@ if __name__ == '__main__':
                        help='Lookback window in hours (default: 24)')
     parser.add_argument('--reanalyze', action='store_true',
                        help='Force re-analysis of cached jobs with updated prompt')
+    parser.add_argument('--fetch-workers', type=int, default=FETCH_WORKERS,
+                       help=f'Concurrent detail page downloads (default: {FETCH_WORKERS})')
+    parser.add_argument('--llm-workers', type=int, default=LLM_WORKERS,
+                       help=f'Concurrent LLM requests (default: {LLM_WORKERS})')
+    parser.add_argument('--model-tier', choices=sorted(GROQ_MODELS), default=DEFAULT_MODEL_TIER,
+                       help=f'Groq model tier (default: {DEFAULT_MODEL_TIER})')
     
     args = parser.parse_args()
     
+    # One-time cleanup of the pre-SQLite analysis cache (no-op once done)
+    setup_logging(args.verbose)
+    remove_legacy_cache_files()
+    
     scrape_multi_site(
         sites=args.sites,
         use_llm=not args.no_llm,
@@ -415,5 +600,8 @@ if __name__ == '__main__':
         incremental=not args.no_incremental,
         lookback_hours=args.lookback,
         llm_quota_per_site=args.quota,
-        reanalyze_cached=args.reanalyze
+        reanalyze_cached=args.reanalyze,
+        fetch_workers=args.fetch_workers,
+        llm_workers=args.llm_workers,
+        model_tier=args.model_tier
     )
@@ -5,15 +5,21 @@ Includes: Retry logic, caching, and structured logging
 """
 
 import os
-import json
+import re
 import time
+import random
 import hashlib
 import logging
-from typing import Dict, Tuple
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, List, Tuple
 from pathlib import Path
-from functools import wraps
+from functools import cache, wraps
 from datetime import datetime
 
+import orjson
+
 
 def setup_logging(verbose=False):
     """Configure structured logging with rotation"""
@@ -33,10 +39,57 @@ def setup_logging(verbose=False):
     return logging.getLogger(__name__)
 
 
+# Substrings identifying a Groq rate-limit error (429, per-minute or daily limits)
+RATE_LIMIT_MARKERS = ('rate_limit', '429', 'too many requests')
+
+
+def is_rate_limit_error(error_str):
+    """Whether a lowercased error message reports a rate limit"""
+    return any(marker in error_str for marker in RATE_LIMIT_MARKERS)
+
+
+# Longest wait between two rate-limited attempts (seconds)
+MAX_RETRY_DELAY = 30
+
+# Groq's rate limit message: "... Please try again in 7.66s" / "1m2.5s" / "506ms"
+# (daily token limits quote hours: "1h2m3.5s")
+RETRY_AFTER_PATTERN = re.compile(r'try again in (?:(\d+)h)?(?:(\d+)m)?([\d.]+)(ms|s)')
+
+
+def retry_after_seconds(error, error_str):
+    """
+    Wait requested by a rate-limit error, or None if it doesn't say
+    
+    Reads the response's Retry-After header when the exception carries
+    one, else the delay quoted in Groq's error message.
+    """
+    response = getattr(error, 'response', None)
+    retry_after = getattr(response, 'headers', {}).get('retry-after')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    
+    match = RETRY_AFTER_PATTERN.search(error_str)
+    if match:
+        hours, minutes, amount, unit = match.groups()
+        seconds = float(amount) / 1000 if unit == 'ms' else float(amount)
+        return int(hours or 0) * 3600 + int(minutes or 0) * 60 + seconds
+    return None
+
+
 def retry_with_backoff(max_retries=3, base_delay=2):
     """
     Decorator to retry function calls with exponential backoff
     
+    Delays are jittered (+/-50%, capped at MAX_RETRY_DELAY) so worker
+    threads hit by the same 429 don't retry in lockstep. A wait quoted by
+    the API replaces the exponential delay: the retry sleeps at least that
+    long (jitter is only added on top), and if it is longer than
+    MAX_RETRY_DELAY the error is raised at once instead of retrying before
+    the limit resets.
+    
     Args:
         max_retries: Maximum number of retry attempts
         base_delay: Initial delay in seconds (doubles each retry)
@@ -49,12 +102,17 @@ def retry_with_backoff(max_retries=3, base_delay=2):
                     return func(*args, **kwargs)
                 except Exception as e:
                     error_str = str(e).lower()
-                    is_rate_limit = any(keyword in error_str for keyword in 
-                                       ['rate_limit', '429', 'too many requests'])
+                    is_rate_limit = is_rate_limit_error(error_str)
                     
                     if is_rate_limit and attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)
-                        print(f"⏳ Rate limit hit, retrying in {delay}s... (attempt {attempt + 1}/{max_retries})")
+                        requested = retry_after_seconds(e, error_str)
+                        if requested is not None:
+                            if requested > MAX_RETRY_DELAY:
+                                raise
+                            delay = requested * random.uniform(1.0, 1.5)
+                        else:
+                            delay = min(MAX_RETRY_DELAY, base_delay * (2 ** attempt)) * random.uniform(0.5, 1.5)
+                        print(f"⏳ Rate limit hit, retrying in {delay:.1f}s... (attempt {attempt + 1}/{max_retries})")
                         time.sleep(delay)
                     else:
                         raise
@@ -63,13 +121,276 @@ def retry_with_backoff(max_retries=3, base_delay=2):
     return decorator
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt (about 4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+# Description length sent to the LLM (about 375 tokens): the remote/on-site
+# signals are in the opening lines, the rest only adds prompt tokens
+MAX_PROMPT_DESCRIPTION_CHARS = 1500
+
+
+def truncate_for_prompt(description: str) -> str:
+    """Cut a description to MAX_PROMPT_DESCRIPTION_CHARS for the prompt"""
+    if len(description) <= MAX_PROMPT_DESCRIPTION_CHARS:
+        return description
+    return description[:MAX_PROMPT_DESCRIPTION_CHARS] + '…'
+
+
+class RateLimiter:
+    """
+    Space calls evenly so request and token budgets per minute are never exceeded
+    
+    Shared by all worker threads: each wait() reserves the next free slot
+    and sleeps until it comes, so requests are paced up front instead of
+    being rejected with 429 and retried. A request holds its slot for
+    60/RPM seconds, or for its share of the token budget if that is longer.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int = 0):
+        self.interval = 60.0 / requests_per_minute
+        self.seconds_per_token = 60.0 / tokens_per_minute if tokens_per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self, tokens: int = 0):
+        """Block until this caller may send a request of about this many tokens"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + max(self.interval, tokens * self.seconds_per_token)
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class QuotaStore:
+    """
+    Daily LLM usage persisted across runs (cache/llm_usage.db)
+    
+    The scraper runs several times a day: each run reads what earlier runs
+    already spent today and records its own usage at the end, so the daily
+    quota is shared by all of them. If the database can't be opened, usage
+    counts as zero and nothing is recorded.
+    """
+    
+    def __init__(self, cache_dir='cache'):
+        self.logger = logging.getLogger(__name__)
+        try:
+            Path(cache_dir).mkdir(exist_ok=True)
+            self._db = sqlite3.connect(Path(cache_dir) / 'llm_usage.db', timeout=10)
+            # Overlapping runs only block each other for the few writes
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS llm_usage ('
+                'day TEXT PRIMARY KEY, jobs INTEGER NOT NULL, tokens INTEGER NOT NULL)'
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM usage database unavailable, daily quota not shared between runs: {e}")
+            self._db = None
+    
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime('%Y-%m-%d')
+    
+    def usage_today(self) -> Tuple[int, int]:
+        """Jobs analyzed and tokens used by the LLM today, across runs"""
+        if self._db is None:
+            return 0, 0
+        try:
+            row = self._db.execute('SELECT jobs, tokens FROM llm_usage WHERE day = ?', (self._today(),)).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM usage read error: {e}")
+            return 0, 0
+        return row if row else (0, 0)
+    
+    def record(self, jobs: int, tokens: int = 0):
+        """Add a run's LLM usage to today's totals"""
+        if self._db is None or not (jobs or tokens):
+            return
+        try:
+            with self._db:
+                self._db.execute(
+                    'INSERT INTO llm_usage VALUES (?, ?, ?) '
+                    'ON CONFLICT(day) DO UPDATE SET jobs = jobs + excluded.jobs, tokens = tokens + excluded.tokens',
+                    (self._today(), jobs, tokens)
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM usage write error: {e}")
+
+
+# Groq requests and tokens per minute allowed for the account (free tier
+# request default; GROQ_TPM=0 leaves tokens unpaced)
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv('GROQ_RPM', '30'))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv('GROQ_TPM', '0'))
+
+# Groq models by tier: 'quality' follows the full guidelines most closely,
+# 'fast' answers several times quicker for large backlogs
+GROQ_MODELS = {
+    'quality': 'moonshotai/kimi-k2-instruct',
+    'fast': 'llama-3.1-8b-instant',
+}
+DEFAULT_MODEL_TIER = 'quality'
+
+# Lemmas of action verbs that indicate physical work (NLP fallback)
+PHYSICAL_VERB_LEMMAS = frozenset({
+    'nettoyer', 'garder', 'réparer', 'construire',
+    'installer', 'déménager', 'cuisiner', 'conduire',
+})
+
+# fr_core_news_md components the NLP fallback doesn't use
+SPACY_UNUSED_PIPES = ['parser', 'ner']
+
+# Texts per nlp.pipe batch in the NLP fallback
+NLP_BATCH_SIZE = 64
+
+# Cached analyses older than this are dropped when the cache is opened, so
+# prompt/model changes eventually reach old listings and the file stays bounded
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+
+@cache
+def get_groq_client(api_key: str):
+    """
+    Groq client shared by every analyzer using this API key
+    
+    The client owns the HTTP connection pool: reusing it across runs in the
+    same process keeps its connections (and TLS sessions) warm.
+    Raises ImportError if the groq package is not installed.
+    """
+    from groq import Groq
+    return Groq(api_key=api_key)
+
+
+def normalize_for_cache(text: str) -> str:
+    """Fold case, Unicode form and whitespace so near-verbatim reposts share a key"""
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def job_cache_key(title: str, description: str, location: str) -> str:
+    """
+    Cache key for a job's analysis
+    
+    Built from the normalized title/description/location, so listings that
+    differ only in case, spacing or accent encoding reuse one LLM result
+    
+    Returns:
+        MD5 hash string
+    """
+    content = f"{normalize_for_cache(title)}|{normalize_for_cache(description)}|{normalize_for_cache(location)}"
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+# Written once the old one-file-per-job cache has been cleaned up
+LEGACY_CACHE_MARKER = '.legacy_cache_removed'
+
+
+def remove_legacy_cache_files(cache_dir='cache') -> int:
+    """
+    Delete the old one-file-per-job cache ({hash}.json), once
+    
+    Those files are keyed on the raw job text, which no lookup has used
+    since the cache key is built from normalized text, so they can never
+    be hit again. A marker file records that the cleanup ran; files that
+    can't be removed are left in place and the marker is not written.
+    
+    Returns:
+        Number of files removed
+    """
+    logger = logging.getLogger(__name__)
+    cache_path = Path(cache_dir)
+    marker = cache_path / LEGACY_CACHE_MARKER
+    if marker.exists() or not cache_path.is_dir():
+        return 0
+    
+    try:
+        legacy_files = [path for path in cache_path.glob('*.json') if len(path.stem) == 32]
+    except OSError as e:
+        logger.warning(f"Could not list legacy cache files: {e}")
+        return 0
+    
+    removed = 0
+    for cache_file in legacy_files:
+        try:
+            cache_file.unlink()
+            removed += 1
+        except OSError as e:
+            logger.warning(f"Could not remove legacy cache file {cache_file}: {e}")
+    logger.info(f"Removed {removed} legacy cache files")
+    
+    if removed == len(legacy_files):
+        try:
+            marker.touch()
+        except OSError as e:
+            logger.warning(f"Could not write legacy cache marker: {e}")
+    return removed
+
+
+# Classification rules shared by the single-job and batch prompts
+REMOTE_ANALYSIS_GUIDELINES = """YOUR TASK:
+Determine if this is a GENUINE remote work opportunity where the worker can perform 100% of their duties from home/anywhere without needing to be physically present.
+
+REMOTE-CAPABLE JOB TYPES (default: remote unless stated otherwise):
+- Web/Software development (sites web, applications, code, WordPress, HTML, CSS, JavaScript, Python, PHP, etc.)
+- Graphic design / Design graphique (logos, affiches, visuels, Photoshop, Illustrator, Canva, etc.)
+- Writing / Rédaction (articles, contenu, copywriting, traduction, blog, etc.)
+- Digital marketing (SEO, réseaux sociaux, publicité en ligne, community management, Facebook Ads)
+- Data entry / Saisie de données
+- Virtual assistance / Assistance virtuelle (administrative tasks online)
+- Online tutoring / Cours en ligne (except if explicitly requires physical classroom)
+- Video editing / Montage vidéo (except if involves mandatory on-site filming)
+- Accounting / Comptabilité (online services, bookkeeping)
+- Customer service / Service client (if online/téléphone/chat)
+- Consulting / Conseil (if deliverables are digital)
+- E-commerce management (gestion boutique en ligne)
+
+ALWAYS ON-SITE JOB TYPES:
+- Physical services: ménage, jardinage, coiffure, cuisine, réparation, construction, plomberie, électricité, peinture
+- Care work: garde d'enfants, aide à domicile, auxiliaire de vie, soins infirmiers, accompagnement personnes âgées
+- Transportation: livraison, déménagement, chauffeur, remorquage, transport
+- Events: animation, DJ, photographe (for events), serveur, traiteur, organisation événements
+- Manual labor: bricolage, installation, assemblage, montage meubles
+
+REMOTE INDICATORS (positive signals):
+- "télétravail", "à distance", "remote", "100% en ligne", "depuis chez vous", "mission flexible", "nomade digital"
+- "WordPress", "site web", "développement", "design", "rédaction", "marketing digital", "création de contenu"
+- "visio", "Zoom", "Google Meet", "Skype", "en ligne", "virtuel"
+- Flexible location or "France entière" without physical address requirements
+- "freelance", "indépendant", "auto-entrepreneur" for digital services
+- Digital deliverables: "logo", "site internet", "application", "contenu", "stratégie", "référencement"
+
+NOT REMOTE INDICATORS (negative signals):
+- Specific city/address requirements for physical presence ("à Paris 15ème", "sur place obligatoire")
+- "sur place", "présentiel", "déplacement requis", "visite client", "intervention physique"
+- Work that requires handling physical objects or being in specific locations
+- "nettoyage", "réparation", "installation", "montage", "garde", "soins"
+
+DECISION RULES:
+1. Digital job (web, design, writing) + NO location constraint = REMOTE ✓
+2. Digital job + "mission flexible" / "télétravail" = REMOTE ✓
+3. Physical service (ménage, garde, réparation) = ALWAYS ON-SITE ✗
+4. Job seeker posting ("Je cherche un emploi") = typically ON-SITE (unless explicitly remote)
+5. Job offer for digital work ("Je cherche développeur") = REMOTE if no location mentioned ✓
+6. Ambiguous digital job without clear signals = DEFAULT to REMOTE (web/design/writing are remote by nature)
+
+CONTEXT MATTERS:
+- "Refonte de site web WordPress" = REMOTE ✓ (digital deliverable)
+- "Créer un logo pour mon entreprise" = REMOTE ✓ (digital deliverable)
+- "Rédaction d'articles SEO" = REMOTE ✓ (digital deliverable)
+- "Développement application mobile" = REMOTE ✓ (digital deliverable)
+- "Je cherche un emploi de développeur" = ON-SITE (job seeker without remote mention)
+- "Développement web - Mission flexible" = REMOTE ✓
+- "Développement sur Paris + réunions hebdomadaires" = ON-SITE (location constraint)
+- "Service de ménage à domicile" = ON-SITE ✗ (physical service)"""
+
+
 class SemanticJobAnalyzer:
     """
     Analyzes job descriptions using LLM or NLP to determine remote work possibility
     Enhanced with caching and retry logic
     """
     
-    def __init__(self, use_groq=True, groq_api_key=None, verbose=False):
+    def __init__(self, use_groq=True, groq_api_key=None, verbose=False, model_tier=DEFAULT_MODEL_TIER):
         """
         Initialize the semantic analyzer
         
@@ -77,9 +398,11 @@ class SemanticJobAnalyzer:
             use_groq: Whether to use Groq API (True) or local NLP (False)
             groq_api_key: Groq API key (optional, can be set in environment)
             verbose: Show detailed progress messages (default False)
+            model_tier: Key of GROQ_MODELS ('quality' or 'fast')
         """
         self.use_groq = use_groq
         self.groq_api_key = groq_api_key or os.getenv('GROQ_API_KEY')
+        self.groq_model = GROQ_MODELS[model_tier]
         self.groq_client = None
         self.nlp_model = None
         self.verbose = verbose
@@ -88,16 +411,27 @@ class SemanticJobAnalyzer:
         self.cache_dir = Path('cache')
         self.cache_dir.mkdir(exist_ok=True)
         
-        # Cache statistics
+        # Cache statistics (updated from worker threads)
         self.cache_stats = {'hits': 0, 'misses': 0}
+        self._stats_lock = threading.Lock()
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
         
+        # Paces Groq calls from all worker threads (retries included)
+        self._rate_limiter = RateLimiter(GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE)
+        self.tokens_used = 0  # Reported by Groq (prompt + completion)
+        self.jobs_analyzed_by_groq = 0  # Fresh (uncached) Groq verdicts
+        
+        # Persistent analysis cache (SQLite), loaded into memory once
+        self._cache_lock = threading.Lock()
+        self._cache_db = None
+        self._cache = {}
+        self._open_cache()
+        
         if self.use_groq and self.groq_api_key:
             try:
-                from groq import Groq
-                self.groq_client = Groq(api_key=self.groq_api_key)
+                self.groq_client = get_groq_client(self.groq_api_key)
                 if self.verbose:
                     print("✅ Groq API initialized successfully")
                 self.logger.info("Groq API initialized successfully")
@@ -128,7 +462,9 @@ class SemanticJobAnalyzer:
         try:
             import spacy
             try:
-                self.nlp_model = spacy.load("fr_core_news_md")
+                # Only lemmas are read: the dependency parser and NER are
+                # not loaded (the lemmatizer needs the morphologizer's POS)
+                self.nlp_model = spacy.load("fr_core_news_md", exclude=SPACY_UNUSED_PIPES)
                 if self.verbose:
                     print("✅ Local NLP (spaCy) initialized successfully")
                 self.logger.info("Local NLP (spaCy) initialized successfully")
@@ -156,42 +492,81 @@ class SemanticJobAnalyzer:
         Returns:
             MD5 hash string
         """
-        content = f"{title}|{description}|{location}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        return job_cache_key(title, description, location)
+    
+    def _open_cache(self):
+        """
+        Open cache/llm_cache.db and load every cached analysis into memory
+        
+        Entries older than CACHE_TTL_SECONDS are deleted first. Lookups are
+        then plain dict hits; the database is only written to.
+        If it can't be opened the cache works in memory for this run.
+        """
+        try:
+            self._cache_db = sqlite3.connect(self.cache_dir / 'llm_cache.db', check_same_thread=False)
+            # Each fresh result is committed on its own: WAL with NORMAL sync
+            # makes those commits appends instead of full journal fsyncs
+            self._cache_db.execute('PRAGMA journal_mode=WAL')
+            self._cache_db.execute('PRAGMA synchronous=NORMAL')
+            self._cache_db.execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache ('
+                'hash TEXT PRIMARY KEY, is_remote INTEGER, confidence REAL, reason TEXT, ts REAL)'
+            )
+            expired = self._cache_db.execute('DELETE FROM llm_cache WHERE ts < ?', (time.time() - CACHE_TTL_SECONDS,))
+            if expired.rowcount:
+                self._cache_db.commit()
+                self.logger.debug(f"Expired {expired.rowcount} cached analyses")
+            rows = self._cache_db.execute('SELECT hash, is_remote, confidence, reason FROM llm_cache')
+            self._cache = {
+                job_hash: {'is_remote': bool(is_remote), 'remote_confidence': confidence, 'reason': reason}
+                for job_hash, is_remote, confidence, reason in rows
+            }
+            self.logger.debug(f"Loaded {len(self._cache)} cached analyses")
+        except sqlite3.Error as e:
+            if self.verbose:
+                print(f"    ⚠️  Cache database unavailable: {e}")
+            self.logger.warning(f"Cache database unavailable, caching in memory only: {e}")
+            self._cache_db = None
     
     def _load_from_cache(self, job_hash: str) -> Dict:
         """Load analysis result from cache if available"""
-        cache_file = self.cache_dir / f"{job_hash}.json"
+        cached_data = self._cache.get(job_hash)
         
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                    self.cache_stats['hits'] += 1
-                    if self.verbose:
-                        print("    ♻️  Using cached analysis")
-                    self.logger.debug(f"Cache hit for job hash: {job_hash}")
-                    return cached_data
-            except (json.JSONDecodeError, IOError) as e:
-                if self.verbose:
-                    print(f"    ⚠️  Cache read error: {e}")
-                self.logger.warning(f"Cache read error for {job_hash}: {e}")
+        if cached_data is not None:
+            with self._stats_lock:
+                self.cache_stats['hits'] += 1
+            if self.verbose:
+                print("    ♻️  Using cached analysis")
+            self.logger.debug(f"Cache hit for job hash: {job_hash}")
+            return dict(cached_data)
         
-        self.cache_stats['misses'] += 1
+        with self._stats_lock:
+            self.cache_stats['misses'] += 1
         return None
     
     def _save_to_cache(self, job_hash: str, result: Dict):
         """Save analysis result to cache"""
-        cache_file = self.cache_dir / f"{job_hash}.json"
+        entry = {
+            'is_remote': bool(result.get('is_remote', False)),
+            'remote_confidence': float(result.get('remote_confidence', 0.5)),
+            'reason': result.get('reason', ''),
+        }
         
-        try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            self.logger.debug(f"Cached result for job hash: {job_hash}")
-        except IOError as e:
-            if self.verbose:
-                print(f"    ⚠️  Cache write error: {e}")
-            self.logger.warning(f"Cache write error for {job_hash}: {e}")
+        with self._cache_lock:
+            self._cache[job_hash] = entry
+            if self._cache_db is None:
+                return
+            try:
+                self._cache_db.execute(
+                    'INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)',
+                    (job_hash, int(entry['is_remote']), entry['remote_confidence'], entry['reason'], time.time())
+                )
+                self._cache_db.commit()
+                self.logger.debug(f"Cached result for job hash: {job_hash}")
+            except sqlite3.Error as e:
+                if self.verbose:
+                    print(f"    ⚠️  Cache write error: {e}")
+                self.logger.warning(f"Cache write error for {job_hash}: {e}")
     
     def get_cache_stats(self) -> Dict:
         """Get cache hit/miss statistics"""
@@ -211,76 +586,26 @@ class SemanticJobAnalyzer:
         """
         Internal implementation of Groq analysis (wrapped with retry logic)
         """
+        # Static instructions first, the listing last: every request starts
+        # with the same prefix, which Groq's prompt caching can reuse
         prompt = f"""You are analyzing a French job listing to determine if it's a genuine remote work opportunity.
 
-JOB LISTING:
-Title: {job_title}
-Location/Category: {job_location}
-Description: {job_description}
-
-YOUR TASK:
-Determine if this is a GENUINE remote work opportunity where the worker can perform 100% of their duties from home/anywhere without needing to be physically present.
-
-REMOTE-CAPABLE JOB TYPES (default: remote unless stated otherwise):
-- Web/Software development (sites web, applications, code, WordPress, HTML, CSS, JavaScript, Python, PHP, etc.)
-- Graphic design / Design graphique (logos, affiches, visuels, Photoshop, Illustrator, Canva, etc.)
-- Writing / Rédaction (articles, contenu, copywriting, traduction, blog, etc.)
-- Digital marketing (SEO, réseaux sociaux, publicité en ligne, community management, Facebook Ads)
-- Data entry / Saisie de données
-- Virtual assistance / Assistance virtuelle (administrative tasks online)
-- Online tutoring / Cours en ligne (except if explicitly requires physical classroom)
-- Video editing / Montage vidéo (except if involves mandatory on-site filming)
-- Accounting / Comptabilité (online services, bookkeeping)
-- Customer service / Service client (if online/téléphone/chat)
-- Consulting / Conseil (if deliverables are digital)
-- E-commerce management (gestion boutique en ligne)
-
-ALWAYS ON-SITE JOB TYPES:
-- Physical services: ménage, jardinage, coiffure, cuisine, réparation, construction, plomberie, électricité, peinture
-- Care work: garde d'enfants, aide à domicile, auxiliaire de vie, soins infirmiers, accompagnement personnes âgées
-- Transportation: livraison, déménagement, chauffeur, remorquage, transport
-- Events: animation, DJ, photographe (for events), serveur, traiteur, organisation événements
-- Manual labor: bricolage, installation, assemblage, montage meubles
-
-REMOTE INDICATORS (positive signals):
-- "télétravail", "à distance", "remote", "100% en ligne", "depuis chez vous", "mission flexible", "nomade digital"
-- "WordPress", "site web", "développement", "design", "rédaction", "marketing digital", "création de contenu"
-- "visio", "Zoom", "Google Meet", "Skype", "en ligne", "virtuel"
-- Flexible location or "France entière" without physical address requirements
-- "freelance", "indépendant", "auto-entrepreneur" for digital services
-- Digital deliverables: "logo", "site internet", "application", "contenu", "stratégie", "référencement"
-
-NOT REMOTE INDICATORS (negative signals):
-- Specific city/address requirements for physical presence ("à Paris 15ème", "sur place obligatoire")
-- "sur place", "présentiel", "déplacement requis", "visite client", "intervention physique"
-- Work that requires handling physical objects or being in specific locations
-- "nettoyage", "réparation", "installation", "montage", "garde", "soins"
-
-DECISION RULES:
-1. Digital job (web, design, writing) + NO location constraint = REMOTE ✓
-2. Digital job + "mission flexible" / "télétravail" = REMOTE ✓
-3. Physical service (ménage, garde, réparation) = ALWAYS ON-SITE ✗
-4. Job seeker posting ("Je cherche un emploi") = typically ON-SITE (unless explicitly remote)
-5. Job offer for digital work ("Je cherche développeur") = REMOTE if no location mentioned ✓
-6. Ambiguous digital job without clear signals = DEFAULT to REMOTE (web/design/writing are remote by nature)
-
-CONTEXT MATTERS:
-- "Refonte de site web WordPress" = REMOTE ✓ (digital deliverable)
-- "Créer un logo pour mon entreprise" = REMOTE ✓ (digital deliverable)
-- "Rédaction d'articles SEO" = REMOTE ✓ (digital deliverable)
-- "Développement application mobile" = REMOTE ✓ (digital deliverable)
-- "Je cherche un emploi de développeur" = ON-SITE (job seeker without remote mention)
-- "Développement web - Mission flexible" = REMOTE ✓
-- "Développement sur Paris + réunions hebdomadaires" = ON-SITE (location constraint)
-- "Service de ménage à domicile" = ON-SITE ✗ (physical service)
+{REMOTE_ANALYSIS_GUIDELINES}
 
 RESPOND IN JSON FORMAT ONLY:
 {{
     "is_remote": true/false,
     "confidence": 0.0-1.0,
     "reason": "clear explanation in French (max 12 words)"
-}}"""
+}}
 
+JOB LISTING:
+Title: {job_title}
+Location/Category: {job_location}
+Description: {truncate_for_prompt(job_description)}"""
+
+        max_tokens = 200
+        self._rate_limiter.wait(estimate_tokens(prompt) + max_tokens)
         chat_completion = self.groq_client.chat.completions.create(
             messages=[
                 {
@@ -292,10 +617,11 @@ RESPOND IN JSON FORMAT ONLY:
                     "content": prompt
                 }
             ],
-            model="moonshotai/kimi-k2-instruct",
-            temperature=0.1,
-            max_tokens=200,
+            model=self.groq_model,
+            temperature=0,
+            max_tokens=max_tokens,
         )
+        self._count_tokens(chat_completion)
         
         response_text = chat_completion.choices[0].message.content.strip()
         
@@ -305,8 +631,18 @@ RESPOND IN JSON FORMAT ONLY:
             end = response_text.rindex('}') + 1
             response_text = response_text[start:end]
         
-        result = json.loads(response_text)
-        
+        return self._parse_llm_result(orjson.loads(response_text))
+    
+    def _count_tokens(self, chat_completion):
+        """Add a completion's reported token usage to tokens_used"""
+        usage = getattr(chat_completion, 'usage', None)
+        if usage is not None:
+            with self._stats_lock:
+                self.tokens_used += usage.total_tokens
+    
+    @staticmethod
+    def _parse_llm_result(result: Dict) -> Dict:
+        """Normalize one LLM verdict into the analyzer's result format"""
         # Extract and validate confidence score
         confidence = result.get('confidence', 0.5)
         if isinstance(confidence, str):
@@ -320,8 +656,120 @@ RESPOND IN JSON FORMAT ONLY:
             'reason': f"LLM: {result.get('reason', 'No reason provided')}"
         }
     
-    def analyze_with_groq(self, job_title: str, job_description: str, 
+    @retry_with_backoff(max_retries=3, base_delay=2)
+    def _analyze_batch_with_groq_impl(self, jobs: List[Tuple[str, str, str]]) -> Dict[int, Dict]:
+        """
+        Internal implementation of batched Groq analysis (wrapped with retry logic)
+        
+        Returns:
+            {position in jobs: result} for every listing the model answered
+        """
+        listings = '\n\n'.join(
+            f"[{number}]\nTitle: {title}\nLocation/Category: {location}\nDescription: {truncate_for_prompt(description)}"
+            for number, (title, description, location) in enumerate(jobs, 1)
+        )
+        
+        # Same layout as the single-job prompt: static prefix, listings last
+        prompt = f"""You are analyzing several French job listings to determine, for each one independently, if it's a genuine remote work opportunity.
+
+{REMOTE_ANALYSIS_GUIDELINES}
+
+RESPOND IN JSON FORMAT ONLY, with one entry per listing:
+[
+    {{
+        "index": listing number,
+        "is_remote": true/false,
+        "confidence": 0.0-1.0,
+        "reason": "clear explanation in French (max 12 words)"
+    }}
+]
+
+JOB LISTINGS ({len(jobs)}):
+{listings}"""
+
+        max_tokens = 200 * len(jobs)
+        self._rate_limiter.wait(estimate_tokens(prompt) + max_tokens)
+        chat_completion = self.groq_client.chat.completions.create(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert job analyst. Respond only with valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=self.groq_model,
+            temperature=0,
+            max_tokens=max_tokens,
+        )
+        self._count_tokens(chat_completion)
+        
+        response_text = chat_completion.choices[0].message.content.strip()
+        
+        # Try to extract the JSON array if there's extra text
+        if '[' in response_text:
+            start = response_text.index('[')
+            end = response_text.rindex(']') + 1
+            response_text = response_text[start:end]
+        
+        results = {}
+        for entry in orjson.loads(response_text):
+            try:
+                position = int(entry['index']) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= position < len(jobs):
+                results[position] = self._parse_llm_result(entry)
+        
+        return results
+    
+    def _handle_groq_error(self, error: Exception, job_title: str, job_description: str,
+                           job_location: str) -> Dict:
+        """Report a failed Groq call and fall back to local NLP"""
+        error_msg = str(error)
+        
+        # Check if it's a rate limit error
+        if 'rate_limit_exceeded' in error_msg or '429' in error_msg:
+            if self.verbose or True:  # Always show rate limit warnings
+                print(f"⚠️  Groq API Rate Limit: {error}")
+                print("⚠️  Falling back to local NLP")
+                print("💡 Tip: Upgrade your Groq plan or reduce scraping frequency")
+            self.logger.error(f"Groq API rate limit exceeded: {error}")
+        else:
+            if self.verbose:
+                print(f"⚠️  Groq API error: {error}")
+                print("⚠️  Falling back to local NLP")
+            self.logger.error(f"Groq API error: {error}", exc_info=True)
+        
+        return self._analyze_with_nlp(job_title, job_description, job_location)
+    
+    def _analyze_uncached(self, job_hash: str, job_title: str, job_description: str,
                           job_location: str, current_classification: str) -> Dict:
+        """Single-job Groq analysis for a cache miss (NLP when Groq is unavailable)"""
+        if not self.groq_client:
+            return self._analyze_with_nlp(job_title, job_description, job_location)
+        
+        try:
+            result = self._analyze_with_groq_impl(job_title, job_description, 
+                                                   job_location, current_classification)
+        except Exception as e:
+            return self._handle_groq_error(e, job_title, job_description, job_location)
+        
+        self._cache_groq_result(job_hash, job_title, result)
+        return result
+    
+    def _cache_groq_result(self, job_hash: str, job_title: str, result: Dict):
+        """Cache, count and log a fresh LLM result"""
+        with self._stats_lock:
+            self.jobs_analyzed_by_groq += 1
+        self._save_to_cache(job_hash, result)
+        self.logger.info(f"Analyzed job: {job_title[:50]}... -> Remote: {result['is_remote']}, Confidence: {result['remote_confidence']}")
+    
+    def analyze_with_groq(self, job_title: str, job_description: str, 
+                          job_location: str, current_classification: str,
+                          bypass_cache: bool = False) -> Dict:
         """
         Analyze job using Groq LLM with caching
         
@@ -330,57 +778,110 @@ RESPOND IN JSON FORMAT ONLY:
             job_description: Job description
             job_location: Job location/category
             current_classification: Current classification (e.g., "ON-SITE LOW")
+            bypass_cache: Ignore any cached result (the fresh one replaces it)
             
         Returns:
             dict with 'is_remote', 'confidence', 'reason'
         """
         # Check cache first
         job_hash = self._get_job_hash(job_title, job_description, job_location)
-        cached_result = self._load_from_cache(job_hash)
+        cached_result = None if bypass_cache else self._load_from_cache(job_hash)
         
         if cached_result is not None:
             return cached_result
         
         # Not in cache, proceed with analysis
-        if not self.groq_client:
-            return self._analyze_with_nlp(job_title, job_description, job_location)
+        return self._analyze_uncached(job_hash, job_title, job_description,
+                                      job_location, current_classification)
+    
+    def analyze_batch_with_groq(self, jobs: List[Tuple[str, str, str, str]],
+                                bypass_cache: bool = False) -> List[Dict]:
+        """
+        Analyze several jobs with one Groq request
         
-        try:
-            result = self._analyze_with_groq_impl(job_title, job_description, 
-                                                   job_location, current_classification)
-            
-            # Cache the result
-            self._save_to_cache(job_hash, result)
-            self.logger.info(f"Analyzed job: {job_title[:50]}... -> Remote: {result['is_remote']}, Confidence: {result['remote_confidence']}")
-            
-            return result
-            
-        except Exception as e:
-            error_msg = str(e)
+        The classification rules are sent once per batch instead of once per
+        job. Cached jobs are answered from the cache; if the batch request
+        fails or skips a listing, those jobs fall back to single-job requests.
+        
+        Args:
+            jobs: List of (job_title, job_description, job_location,
+                  current_classification), ideally 10-20 per batch
+            bypass_cache: Ignore cached results (the fresh ones replace them)
             
-            # Check if it's a rate limit error
-            if 'rate_limit_exceeded' in error_msg or '429' in error_msg:
-                if self.verbose or True:  # Always show rate limit warnings
-                    print(f"⚠️  Groq API Rate Limit: {e}")
-                    print("⚠️  Falling back to local NLP")
-                    print("💡 Tip: Upgrade your Groq plan or reduce scraping frequency")
-                self.logger.error(f"Groq API rate limit exceeded: {e}")
+        Returns:
+            List of result dicts, in the same order as jobs
+        """
+        results = [None] * len(jobs)
+        misses = []
+        for position, (job_title, job_description, job_location, _) in enumerate(jobs):
+            job_hash = self._get_job_hash(job_title, job_description, job_location)
+            cached_result = None if bypass_cache else self._load_from_cache(job_hash)
+            if cached_result is not None:
+                results[position] = cached_result
             else:
-                if self.verbose:
-                    print(f"⚠️  Groq API error: {e}")
-                    print("⚠️  Falling back to local NLP")
-                self.logger.error(f"Groq API error: {e}", exc_info=True)
+                misses.append((position, job_hash))
+        
+        use_nlp = not self.groq_client
+        
+        # A lone miss goes through the single-job prompt below
+        if self.groq_client and len(misses) > 1:
+            try:
+                batch_results = self._analyze_batch_with_groq_impl([jobs[position][:3] for position, _ in misses])
+            except Exception as e:
+                if is_rate_limit_error(str(e).lower()):
+                    # Still limited after the retries: one request per job
+                    # would only add to the refused calls
+                    self.logger.warning(f"Batch analysis of {len(misses)} jobs rate limited, using local NLP: {e}")
+                    use_nlp = True
+                else:
+                    self.logger.warning(f"Batch analysis of {len(misses)} jobs failed, retrying one by one: {e}")
+                batch_results = {}
             
-            return self._analyze_with_nlp(job_title, job_description, job_location)
+            for batch_position, (position, job_hash) in enumerate(misses):
+                result = batch_results.get(batch_position)
+                if result is not None:
+                    self._cache_groq_result(job_hash, jobs[position][0], result)
+                    results[position] = result
+        
+        remaining = [(position, job_hash) for position, job_hash in misses if results[position] is None]
+        if use_nlp and remaining:
+            # NLP fallback: spaCy processes the whole batch in one pipe
+            nlp_results = self._analyze_many_with_nlp([jobs[position][:3] for position, _ in remaining])
+            for (position, _), result in zip(remaining, nlp_results):
+                results[position] = result
+        else:
+            for position, job_hash in remaining:
+                results[position] = self._analyze_uncached(job_hash, *jobs[position])
+        
+        return results
+    
+    @staticmethod
+    def _nlp_text(job_title: str, job_description: str, job_location: str) -> str:
+        """Lowercased text scored by the NLP fallback"""
+        return f"{job_title} {job_description} {job_location}".lower()
+    
+    def _analyze_many_with_nlp(self, jobs: List[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Run the NLP fallback on several (title, description, location) jobs
+        
+        spaCy processes the texts in batches through nlp.pipe instead of one
+        call per job; the scoring is the same as _analyze_with_nlp.
+        """
+        if not self.nlp_model:
+            return [self._analyze_with_nlp(*job) for job in jobs]
+        
+        docs = self.nlp_model.pipe((self._nlp_text(*job)[:1000] for job in jobs), batch_size=NLP_BATCH_SIZE)
+        return [self._analyze_with_nlp(*job, doc=doc) for job, doc in zip(jobs, docs)]
     
     def _analyze_with_nlp(self, job_title: str, job_description: str, 
-                          job_location: str) -> Dict:
+                          job_location: str, doc=None) -> Dict:
         """
         Analyze job using local NLP (fallback method)
         
         Uses keyword frequency and context analysis
+        (doc: the text's spaCy Doc, if already processed)
         """
-        text = f"{job_title} {job_description} {job_location}".lower()
+        text = self._nlp_text(job_title, job_description, job_location)
         
         # Enhanced keyword lists
         strong_remote_keywords = [
@@ -417,15 +918,11 @@ RESPOND IN JSON FORMAT ONLY:
         
         # Analyze with spaCy if available
         if self.nlp_model:
-            doc = self.nlp_model(text[:1000])  # Limit to 1000 chars for speed
+            if doc is None:
+                doc = self.nlp_model(text[:1000])  # Limit to 1000 chars for speed
             
             # Look for action verbs that indicate physical work
-            physical_verbs = ['nettoyer', 'garder', 'réparer', 'construire', 
-                            'installer', 'déménager', 'cuisiner', 'conduire']
-            
-            for token in doc:
-                if token.lemma_ in physical_verbs:
-                    onsite_score += 2
+            onsite_score += 2 * sum(1 for token in doc if token.lemma_ in PHYSICAL_VERB_LEMMAS)
         
         if self.verbose:
             print(f"    📊 NLP Scores - Remote: {remote_score}, On-site: {onsite_score}")
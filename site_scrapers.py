@@ -7,9 +7,90 @@ Generalized scraper framework supporting multiple job platforms
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+from lxml import etree
 from urllib.parse import urljoin
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
+import re
+
+
+# Listing pages fetched concurrently per site in scrape_multiple_pages
+PAGE_WORKERS = 10
+
+# Page limit per site when only some NEW jobs spend the quota: the quota
+# alone no longer bounds the crawl (see scrape_with_incremental_quota)
+DEFAULT_MAX_PAGES_PER_SITE = 10
+
+# Pages in a row holding only already kept listings before a site is
+# given up (some sites keep serving their last page past the end)
+MAX_SEEN_ONLY_PAGES = 2
+
+
+# Listing dates are rendered as dd/mm/yyyy somewhere in the card
+DATE_RE = re.compile(r'\b\d{2}/\d{2}/\d{4}\b')
+
+
+def _xpath_class(name: str) -> str:
+    """XPath predicate matching one CSS class token, like bs4's class_="""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Bytes handed to the pull parser at a time
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# JeMePropose card fields, compiled once and evaluated per card
+JMP_TITLE_XP = etree.XPath(f"(.//span[{_xpath_class('card-title')}])[1]")
+JMP_LOCATION_XP = etree.XPath(f"(.//a[{_xpath_class('grey_jmp_text')}])[1]")
+JMP_PRICE_XP = etree.XPath(f"(.//div/b[{_xpath_class('orange_jmp_text')}])[1]")
+JMP_PRICE_UNIT_XP = etree.XPath('following-sibling::small[1]')
+JMP_POSTER_XP = etree.XPath(f"(.//p/b[{_xpath_class('orange_jmp_text')}])[1]")
+JMP_DESCRIPTION_XP = etree.XPath(f"(.//p[{_xpath_class('card-text')}])[1]")
+JMP_SPAN_TEXT_XP = etree.XPath('.//span[not(*)]/text()')
+TEXT_NODES_XP = etree.XPath('.//text()')
+
+
+def _node_text(nodes) -> str:
+    """Text of the first node in an XPath result, like get_text(strip=True)"""
+    if not nodes:
+        return 'N/A'
+    return ''.join(text.strip() for text in TEXT_NODES_XP(nodes[0]))
+
+
+def declared_charset(response: requests.Response) -> Optional[str]:
+    """Charset from Content-Type, or None (requests' ISO-8859-1 guess is not one)"""
+    if 'charset' in response.headers.get('content-type', '').lower():
+        return response.encoding
+    return None
+
+
+def job_identity(job: Dict):
+    """Key identifying a listing across pages and sites: its URL, else its content"""
+    url = job.get('url')
+    if url and url != 'N/A':
+        return url
+    return (job.get('title'), job.get('source'), job.get('description', '')[:200])
+
+
+def create_session(headers: Dict[str, str], pool_size: int = PAGE_WORKERS) -> requests.Session:
+    """
+    Build a keep-alive HTTP session with the given default headers
+    
+    Connections are pooled per host (pool_size per pool, enough for the
+    concurrent page fetches) and transient failures are retried with
+    backoff before the caller sees an error.
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset({'GET'}))
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
 class BaseSiteScraper(ABC):
@@ -18,7 +99,7 @@ class BaseSiteScraper(ABC):
     Each site implements its own parsing logic
     """
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, session: Optional[requests.Session] = None):
         self.verbose = verbose
         self.logger = logging.getLogger(self.__class__.__name__)
         self.headers = {
@@ -26,6 +107,9 @@ class BaseSiteScraper(ABC):
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
         }
+        # Every page of a site is on the same host: reuse the TCP/TLS connection
+        # (a session built with the same headers may be shared, it pools per host)
+        self.session = session if session is not None else create_session(self.headers)
     
     @property
     @abstractmethod
@@ -56,10 +140,42 @@ class BaseSiteScraper(ABC):
             - description: str
             - location: str
             - price: str (optional)
+            - poster: str (optional)
+            - date_posted: str (optional)
             - source: str (site name)
         """
         pass
     
+    def fetch_page(self, url: str) -> requests.Response:
+        """Download a listing page"""
+        if self.verbose:
+            self.logger.debug(f"Scraping {url}")
+        
+        response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        return response
+    
+    def extract_jobs_from_response(self, response: requests.Response, url: str) -> List[Dict]:
+        """
+        Extract job listings from a downloaded page
+        
+        Defaults to BeautifulSoup + extract_jobs_from_page; sites with a
+        stable layout can override this with a faster parser
+        """
+        # Hand over the declared charset so bs4 skips sniffing
+        soup = BeautifulSoup(response.content, 'lxml', from_encoding=declared_charset(response))
+        return self.extract_jobs_from_page(soup, url)
+    
+    def parse_page(self, response: requests.Response, url: str) -> List[Dict]:
+        """Parse a downloaded listing page into job dictionaries"""
+        jobs = self.extract_jobs_from_response(response, url)
+        
+        # Add source to each job
+        for job in jobs:
+            job['source'] = self.site_name
+        
+        return jobs
+    
     def scrape_page(self, page_num: int) -> tuple[List[Dict], bool]:
         """
         Scrape a single page
@@ -70,19 +186,7 @@ class BaseSiteScraper(ABC):
         url = self.build_page_url(page_num)
         
         try:
-            if self.verbose:
-                self.logger.debug(f"Scraping {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            jobs = self.extract_jobs_from_page(soup, url)
-            
-            # Add source to each job
-            for job in jobs:
-                job['source'] = self.site_name
-            
+            jobs = self.parse_page(self.fetch_page(url), url)
             has_more = len(jobs) > 0
             
             return jobs, has_more
@@ -91,6 +195,21 @@ class BaseSiteScraper(ABC):
             self.logger.error(f"Error scraping {url}: {e}")
             return [], False
     
+    def scrape_fetched_page(self, download: Future, url: str) -> tuple[List[Dict], bool]:
+        """
+        Same as scrape_page, for a fetch_page call already submitted to an executor
+        
+        Returns:
+            (jobs_list, has_more_pages)
+        """
+        try:
+            jobs = self.parse_page(download.result(), url)
+            return jobs, len(jobs) > 0
+            
+        except Exception as e:
+            self.logger.error(f"Error scraping {url}: {e}")
+            return [], False
+    
     def scrape_multiple_pages(self, max_pages: int = 10) -> List[Dict]:
         """
         Scrape multiple pages
@@ -102,22 +221,39 @@ class BaseSiteScraper(ABC):
             List of all jobs found
         """
         all_jobs = []
+        if max_pages < 1:
+            return all_jobs
         
-        for page_num in range(1, max_pages + 1):
-            if self.verbose:
-                print(f"  📄 {self.site_name} - Page {page_num}/{max_pages}")
-            
-            jobs, has_more = self.scrape_page(page_num)
+        # Page downloads are I/O-bound: issue them all up front, then parse
+        # in page order so the first empty page still ends the scrape
+        urls = [self.build_page_url(page_num) for page_num in range(1, max_pages + 1)]
+        
+        with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, max_pages)) as pool:
+            futures = [pool.submit(self.fetch_page, url) for url in urls]
             
-            if not has_more:
+            for page_num, (url, future) in enumerate(zip(urls, futures), 1):
                 if self.verbose:
-                    print(f"  ⚠️  No more jobs on {self.site_name} page {page_num}")
-                break
-            
-            all_jobs.extend(jobs)
+                    print(f"  📄 {self.site_name} - Page {page_num}/{max_pages}")
+                
+                try:
+                    jobs = self.parse_page(future.result(), url)
+                except Exception as e:
+                    self.logger.error(f"Error scraping {url}: {e}")
+                    jobs = []
+                
+                if not jobs:
+                    if self.verbose:
+                        print(f"  ⚠️  No more jobs on {self.site_name} page {page_num}")
+                    break
+                
+                all_jobs.extend(jobs)
+                
+                if self.verbose:
+                    print(f"  ✅ Found {len(jobs)} jobs ({len(all_jobs)} total)")
             
-            if self.verbose:
-                print(f"  ✅ Found {len(jobs)} jobs ({len(all_jobs)} total)")
+            # Past the last page: drop downloads that have not started yet
+            for future in futures:
+                future.cancel()
         
         return all_jobs
 
@@ -138,6 +274,65 @@ class JeMeProposeScraper(BaseSiteScraper):
             return self.base_url
         return f"{self.base_url}&page={page_num}"
     
+    def extract_jobs_from_response(self, response: requests.Response, url: str) -> List[Dict]:
+        # Same fields as extract_jobs_from_page, read with precompiled XPath
+        # on lxml elements instead of several bs4 searches per card. The page
+        # is pull-parsed in chunks and each card is emptied once read, so the
+        # tree never holds more than one card's subtree
+        parser = etree.HTMLPullParser(events=('end',), tag='div', encoding=declared_charset(response))
+        jobs = []
+        
+        for chunk in response.iter_content(chunk_size=PARSE_CHUNK_SIZE):
+            parser.feed(chunk)
+            self._collect_cards(parser, url, jobs)
+        
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            # Raised for an empty body: no cards
+            return jobs
+        self._collect_cards(parser, url, jobs)
+        
+        return jobs
+    
+    def _collect_cards(self, parser: etree.HTMLPullParser, page_url: str, jobs: List[Dict]):
+        """Turn the job cards completed so far into job dicts, then free them"""
+        for _, card in parser.read_events():
+            if card.get('data-url') is None:
+                continue
+            jobs.append(self._card_to_job(card, page_url))
+            card.clear(keep_tail=True)
+    
+    @staticmethod
+    def _card_to_job(card, page_url: str) -> Dict:
+        """Read one job card's fields with the JMP_* XPath expressions"""
+        job_url = card.get('data-url', 'N/A')
+        
+        job_price = 'N/A'
+        price_tags = JMP_PRICE_XP(card)
+        if price_tags:
+            job_price = _node_text(price_tags)
+            unit_tags = JMP_PRICE_UNIT_XP(price_tags[0])
+            if unit_tags:
+                job_price += ' ' + _node_text(unit_tags)
+        
+        job_date = 'N/A'
+        for span_text in JMP_SPAN_TEXT_XP(card):
+            match = DATE_RE.search(span_text)
+            if match:
+                job_date = match.group(0)
+                break
+        
+        return {
+            'url': urljoin(page_url, job_url) if job_url != 'N/A' else 'N/A',
+            'title': _node_text(JMP_TITLE_XP(card)),
+            'description': _node_text(JMP_DESCRIPTION_XP(card)),
+            'location': _node_text(JMP_LOCATION_XP(card)),
+            'price': job_price,
+            'poster': _node_text(JMP_POSTER_XP(card)),
+            'date_posted': job_date,
+        }
+    
     def extract_jobs_from_page(self, soup: BeautifulSoup, page_url: str) -> List[Dict]:
         jobs = []
         job_cards = soup.find_all('div', attrs={'data-url': True})
@@ -156,26 +351,40 @@ class JeMeProposeScraper(BaseSiteScraper):
             if location_tag:
                 job_location = location_tag.get_text(strip=True)
             
+            # Price (<b> inside a div) and poster (<b> inside a p) share the
+            # same tag, so walk the card once and branch on the parent
             job_price = 'N/A'
-            price_tags = card.find_all('b', class_='orange_jmp_text')
-            for price_tag in price_tags:
-                if price_tag.parent.name == 'div':
-                    price_text = price_tag.get_text(strip=True)
-                    small_tag = price_tag.find_next_sibling('small')
+            job_poster = 'N/A'
+            for orange_tag in card.find_all('b', class_='orange_jmp_text'):
+                if orange_tag.parent.name == 'div' and job_price == 'N/A':
+                    price_text = orange_tag.get_text(strip=True)
+                    small_tag = orange_tag.find_next_sibling('small')
                     if small_tag:
                         price_text += ' ' + small_tag.get_text(strip=True)
                     job_price = price_text
+                elif orange_tag.parent.name == 'p' and job_poster == 'N/A':
+                    job_poster = orange_tag.get_text(strip=True)
+                if job_price != 'N/A' and job_poster != 'N/A':
                     break
             
             job_description = card.find('p', class_='card-text')
             job_description = job_description.get_text(strip=True) if job_description else 'N/A'
             
+            # Let find() apply the precompiled date pattern to span strings
+            # instead of pulling every span's text back into Python
+            job_date = 'N/A'
+            date_tag = card.find('span', string=DATE_RE)
+            if date_tag:
+                job_date = DATE_RE.search(date_tag.string).group(0)
+            
             jobs.append({
                 'url': job_full_url,
                 'title': job_title,
                 'description': job_description,
                 'location': job_location,
                 'price': job_price,
+                'poster': job_poster,
+                'date_posted': job_date,
             })
         
         return jobs
@@ -438,6 +647,7 @@ class MultiSiteScraper:
         self.verbose = verbose
         self.logger = logging.getLogger('MultiSiteScraper')
         self.scrapers: Dict[str, BaseSiteScraper] = {}
+        self.duplicates_removed = 0  # Repeated listings dropped by the last quota scrape
     
     def register_scraper(self, scraper: BaseSiteScraper):
         """Register a site scraper"""
@@ -449,6 +659,11 @@ class MultiSiteScraper:
         """
         Scrape all registered sites
         
+        Sites run concurrently. The scheduled pipeline uses
+        scrape_with_incremental_quota instead, which goes through sites one
+        at a time because each site's quota depends on what the previous
+        ones used.
+        
         Args:
             max_pages_per_site: Max pages to scrape per site
             enabled_sites: List of site names to scrape (None = all)
@@ -463,26 +678,37 @@ class MultiSiteScraper:
         if self.verbose:
             print(f"\n🌐 Scraping {len(sites_to_scrape)} sites...")
         
+        site_names = []
         for site_name in sites_to_scrape:
             if site_name not in self.scrapers:
                 self.logger.warning(f"Scraper not found: {site_name}")
                 continue
+            site_names.append(site_name)
+        
+        if not site_names:
+            return results
+        
+        # Sites are independent hosts (a shared session keeps one connection
+        # pool per host), so they are scraped side by side: the phase takes as
+        # long as the slowest
+        with ThreadPoolExecutor(max_workers=len(site_names)) as pool:
+            futures = {
+                site_name: pool.submit(self.scrapers[site_name].scrape_multiple_pages, max_pages=max_pages_per_site)
+                for site_name in site_names
+            }
             
-            scraper = self.scrapers[site_name]
-            
-            if self.verbose:
-                print(f"\n📡 {site_name.upper()}")
-            
-            try:
-                jobs = scraper.scrape_multiple_pages(max_pages=max_pages_per_site)
-                results[site_name] = jobs
-                
-                if self.verbose:
-                    print(f"  ✅ Total: {len(jobs)} jobs from {site_name}")
-                
-            except Exception as e:
-                self.logger.error(f"Error scraping {site_name}: {e}")
-                results[site_name] = []
+            for site_name, future in futures.items():
+                try:
+                    jobs = future.result()
+                    results[site_name] = jobs
+                    
+                    if self.verbose:
+                        print(f"\n📡 {site_name.upper()}")
+                        print(f"  ✅ Total: {len(jobs)} jobs from {site_name}")
+                    
+                except Exception as e:
+                    self.logger.error(f"Error scraping {site_name}: {e}")
+                    results[site_name] = []
         
         return results
     
@@ -510,13 +736,39 @@ class MultiSiteScraper:
         
         return all_jobs
     
+    @staticmethod
+    def _take_within_quota(jobs: List[Dict], space: int, quota_cost=None) -> tuple:
+        """
+        Take NEW jobs in page order while quota space remains
+        
+        Jobs for which quota_cost(job) is false cost nothing and are always
+        taken.
+        
+        Returns:
+            (taken_jobs, quota_spent)
+        """
+        if quota_cost is None:
+            taken = jobs[:max(space, 0)]
+            return taken, len(taken)
+        
+        taken = []
+        spent = 0
+        for job in jobs:
+            if not quota_cost(job):
+                taken.append(job)
+            elif spent < space:
+                taken.append(job)
+                spent += 1
+        return taken, spent
+    
     def scrape_with_incremental_quota(
         self, 
         daily_quota: int,
         enabled_sites: Optional[List[str]] = None, 
         max_pages_per_site: Optional[int] = None,
         incremental_filter_callback = None,
-        lookback_hours: int = 24
+        lookback_hours: int = 24,
+        quota_cost = None
     ) -> tuple:
         """
         Intelligent page-by-page scraping with incremental quota management
@@ -531,16 +783,27 @@ class MultiSiteScraper:
         Args:
             daily_quota: Total LLM jobs allowed per day (e.g., 250)
             enabled_sites: List of site names to scrape
-            max_pages_per_site: Hard limit on pages per site (None = unlimited)
+            max_pages_per_site: Hard limit on pages per site (None = unlimited,
+                or DEFAULT_MAX_PAGES_PER_SITE when quota_cost is given)
             incremental_filter_callback: Function to filter new vs cached jobs
             lookback_hours: Hours to look back for incremental filtering
+            quota_cost: Optional predicate telling whether a NEW job will use
+                the LLM; jobs it rejects are kept without spending quota
+                (None = every NEW job counts)
             
         Returns:
-            tuple: (all_scraped_jobs, jobs_to_analyze, quota_used)
+            tuple: (all_scraped_jobs, jobs_to_analyze, cached_jobs, quota_used)
         """
+        # Jobs quota_cost rejects are free: a site full of them would
+        # otherwise be crawled to its last page
+        if max_pages_per_site is None and quota_cost is not None:
+            max_pages_per_site = DEFAULT_MAX_PAGES_PER_SITE
+        
         all_scraped_jobs = []
         all_jobs_to_analyze = []
         all_cached_jobs = []  # Track cached jobs separately
+        seen_jobs = set()  # job_identity of every listing kept so far
+        self.duplicates_removed = 0
         sites_to_scrape = enabled_sites if enabled_sites else list(self.scrapers.keys())
         
         remaining_quota = daily_quota
@@ -553,6 +816,9 @@ class MultiSiteScraper:
             print(f"   Initial quota per site: {quota_per_site} jobs")
             print(f"   Sites: {len(sites_to_scrape)}")
         
+        # Page N+1 downloads while page N is parsed and filtered
+        prefetch = ThreadPoolExecutor(max_workers=2)
+        
         for site_idx, site_name in enumerate(sites_to_scrape, 1):
             if site_name not in self.scrapers:
                 self.logger.warning(f"Scraper not found: {site_name}")
@@ -578,7 +844,11 @@ class MultiSiteScraper:
                 site_scraped_jobs = []
                 site_new_jobs = []
                 site_cached_jobs = []  # Track cached jobs for this site
+                site_quota_used = 0  # NEW jobs counted against the quota
                 page_num = 1
+                next_download = None  # Prefetched download of page_num, if any
+                seen_only_pages = 0  # Consecutive pages with no unseen listing
+                previous_page_keys = None
                 
                 while True:
                     # Check page limit
@@ -588,22 +858,57 @@ class MultiSiteScraper:
                         break
                     
                     # Check if we've hit site quota
-                    if len(site_new_jobs) >= site_quota:
+                    if site_quota_used >= site_quota:
                         if self.verbose:
-                            print(f"   ✅ Site quota reached: {len(site_new_jobs)}/{site_quota}")
+                            print(f"   ✅ Site quota reached: {site_quota_used}/{site_quota}")
                         break
                     
                     if self.verbose:
-                        print(f"   📄 Page {page_num} (NEW so far: {len(site_new_jobs)}/{site_quota})")
+                        print(f"   📄 Page {page_num} (NEW so far: {len(site_new_jobs)}, quota used: {site_quota_used}/{site_quota})")
                     
-                    # Scrape one page
-                    jobs, has_more = scraper.scrape_page(page_num)
+                    # Scrape one page, starting the next download before parsing it
+                    page_url = scraper.build_page_url(page_num)
+                    download = next_download or prefetch.submit(scraper.fetch_page, page_url)
+                    next_download = None
+                    if not max_pages_per_site or page_num < max_pages_per_site:
+                        next_download = prefetch.submit(scraper.fetch_page, scraper.build_page_url(page_num + 1))
+                    
+                    jobs, has_more = scraper.scrape_fetched_page(download, page_url)
                     
                     if not jobs:
                         if self.verbose:
                             print(f"      No jobs found")
                         break
                     
+                    # Drop listings already kept this run (shifted pagination,
+                    # cross-posts) before they cost a filter, fetch or LLM call
+                    page_keys = [job_identity(job) for job in jobs]
+                    unique_jobs = []
+                    for job, key in zip(jobs, page_keys):
+                        if key not in seen_jobs:
+                            seen_jobs.add(key)
+                            unique_jobs.append(job)
+                    self.duplicates_removed += len(jobs) - len(unique_jobs)
+                    
+                    # Earlier cards pushed down by new postings: the next
+                    # page can still hold unseen jobs. A page repeating the
+                    # previous one, or several seen-only pages in a row, means
+                    # the site is serving its last page again
+                    repeated_page = set(page_keys) == previous_page_keys
+                    previous_page_keys = set(page_keys)
+                    if not unique_jobs:
+                        seen_only_pages += 1
+                        if repeated_page or seen_only_pages >= MAX_SEEN_ONLY_PAGES:
+                            if self.verbose:
+                                print(f"   🏁 Site exhausted - no unseen jobs on the last pages")
+                            break
+                        if self.verbose:
+                            print(f"      Only already seen jobs")
+                        page_num += 1
+                        continue
+                    seen_only_pages = 0
+                    jobs = unique_jobs
+                    
                     if self.verbose:
                         print(f"      Scraped: {len(jobs)} jobs")
                     
@@ -623,20 +928,20 @@ class MultiSiteScraper:
                         site_cached_jobs.extend(page_cached_jobs)
                         
                         # Add NEW jobs (respecting site quota)
-                        space_remaining = site_quota - len(site_new_jobs)
-                        jobs_to_add = page_new_jobs[:space_remaining]
+                        jobs_to_add, spent = self._take_within_quota(page_new_jobs, site_quota - site_quota_used, quota_cost)
                         site_new_jobs.extend(jobs_to_add)
+                        site_quota_used += spent
                         
                         if self.verbose and len(jobs_to_add) < len(page_new_jobs):
                             print(f"      ⚠️  Quota limit: taking {len(jobs_to_add)}/{len(page_new_jobs)} NEW jobs")
                     else:
                         # No incremental filtering, count all as new
-                        space_remaining = site_quota - len(site_new_jobs)
-                        jobs_to_add = jobs[:space_remaining]
+                        jobs_to_add, spent = self._take_within_quota(jobs, site_quota - site_quota_used, quota_cost)
                         site_new_jobs.extend(jobs_to_add)
+                        site_quota_used += spent
                     
                     # Check if we hit quota
-                    if len(site_new_jobs) >= site_quota:
+                    if site_quota_used >= site_quota:
                         if self.verbose:
                             print(f"   ✅ Site quota reached after page {page_num}")
                         break
@@ -649,12 +954,16 @@ class MultiSiteScraper:
                     
                     page_num += 1
                 
+                # Stopped early: the prefetched page is not needed
+                if next_download:
+                    next_download.cancel()
+                
                 # Update totals
                 all_scraped_jobs.extend(site_scraped_jobs)
                 all_jobs_to_analyze.extend(site_new_jobs)
                 all_cached_jobs.extend(site_cached_jobs)  # Track cached jobs
                 
-                quota_used = len(site_new_jobs)
+                quota_used = site_quota_used
                 remaining_quota -= quota_used
                 
                 if self.verbose:
@@ -664,8 +973,8 @@ class MultiSiteScraper:
                     print(f"      Cached jobs: {len(site_cached_jobs)}")
                     
                     # Show if site was exhausted or hit quota
-                    if len(site_new_jobs) < site_quota:
-                        unused = site_quota - len(site_new_jobs)
+                    if quota_used < site_quota:
+                        unused = site_quota - quota_used
                         print(f"      ⚠️  Site exhausted: {unused} quota unused (will redistribute)")
                     
                     print(f"      💰 Budget remaining: {remaining_quota}/{daily_quota}")
@@ -681,6 +990,8 @@ class MultiSiteScraper:
                 if self.verbose:
                     print(f"   ❌ Error: {e}")
         
+        prefetch.shutdown(cancel_futures=True)
+        
         if self.verbose:
             print(f"\n{'='*60}")
             print(f"📊 Scraping complete!")
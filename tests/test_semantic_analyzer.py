@@ -0,0 +1,89 @@
+"""Tests for semantic_analyzer's rate-limit waits and legacy cache cleanup"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from semantic_analyzer import LEGACY_CACHE_MARKER, remove_legacy_cache_files, retry_after_seconds
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeRateLimitError(Exception):
+    """Stands in for the Groq client's error, which carries the HTTP response"""
+    
+    def __init__(self, message, headers=None):
+        super().__init__(message)
+        self.response = FakeResponse(headers or {})
+
+
+def requested_wait(message, headers=None):
+    error = FakeRateLimitError(message, headers)
+    return retry_after_seconds(error, str(error).lower())
+
+
+class RetryAfterSecondsTest(unittest.TestCase):
+    
+    def test_seconds(self):
+        self.assertAlmostEqual(requested_wait('Rate limit reached. Please try again in 7.66s.'), 7.66)
+    
+    def test_milliseconds(self):
+        self.assertAlmostEqual(requested_wait('Please try again in 506ms.'), 0.506)
+    
+    def test_minutes_and_seconds(self):
+        self.assertAlmostEqual(requested_wait('Please try again in 1m2.5s.'), 62.5)
+    
+    def test_hours_minutes_and_seconds(self):
+        self.assertAlmostEqual(requested_wait('Please try again in 1h2m3.5s.'), 3723.5)
+    
+    def test_hours_and_seconds(self):
+        self.assertAlmostEqual(requested_wait('Please try again in 2h0.5s.'), 7200.5)
+    
+    def test_retry_after_header_wins_over_message(self):
+        wait = requested_wait('Please try again in 7.66s.', headers={'retry-after': '12'})
+        self.assertEqual(wait, 12.0)
+    
+    def test_unreadable_header_falls_back_to_message(self):
+        wait = requested_wait('Please try again in 7.66s.', headers={'retry-after': 'soon'})
+        self.assertAlmostEqual(wait, 7.66)
+    
+    def test_no_wait_quoted(self):
+        self.assertIsNone(requested_wait('Error code: 429 - too many requests'))
+    
+    def test_error_without_response(self):
+        error = Exception('Please try again in 3s.')
+        self.assertAlmostEqual(retry_after_seconds(error, str(error).lower()), 3.0)
+
+
+
+class RemoveLegacyCacheFilesTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_removes_hash_files_once(self):
+        (self.cache_dir / f"{'a' * 32}.json").write_text('{}')
+        (self.cache_dir / f"{'b' * 32}.json").write_text('{}')
+        (self.cache_dir / 'settings.json').write_text('{}')
+        
+        with self.assertLogs('semantic_analyzer', level='INFO') as logs:
+            self.assertEqual(remove_legacy_cache_files(self.cache_dir), 2)
+        self.assertIn('Removed 2 legacy cache files', logs.output[0])
+        self.assertTrue((self.cache_dir / 'settings.json').exists())
+        self.assertTrue((self.cache_dir / LEGACY_CACHE_MARKER).exists())
+        
+        # Later runs don't scan the directory again
+        (self.cache_dir / f"{'c' * 32}.json").write_text('{}')
+        self.assertEqual(remove_legacy_cache_files(self.cache_dir), 0)
+        self.assertTrue((self.cache_dir / f"{'c' * 32}.json").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for the page-by-page quota scraping in site_scrapers"""
+
+import unittest
+
+from site_scrapers import DEFAULT_MAX_PAGES_PER_SITE, BaseSiteScraper, MultiSiteScraper
+
+
+def make_job(name):
+    return {
+        'title': name,
+        'description': f'{name} description',
+        'location': 'A Distance',
+        'url': f'https://example.com/annonces/{name}',
+    }
+
+
+class FakeScraper(BaseSiteScraper):
+    """Serves fixed pages without network access; page_num -> job names"""
+    
+    def __init__(self, pages, last_page=None):
+        super().__init__()
+        self.pages = pages
+        self.last_page = last_page  # Served again for every page past the end
+        self.fetched = []
+    
+    @property
+    def site_name(self):
+        return 'fake'
+    
+    @property
+    def base_url(self):
+        return 'https://example.com/annonces'
+    
+    def build_page_url(self, page_num):
+        return page_num
+    
+    def extract_jobs_from_page(self, soup, page_url):
+        return []
+    
+    def fetch_page(self, url):
+        self.fetched.append(url)
+        # Safety net so a regression fails instead of hanging the test run
+        if len(self.fetched) > 50:
+            return []
+        return self.pages.get(url, self.last_page or [])
+    
+    def parse_page(self, names, url):
+        return [dict(make_job(name), source=self.site_name) for name in names]
+
+
+def scrape(scraper, **kwargs):
+    multi_scraper = MultiSiteScraper()
+    multi_scraper.register_scraper(scraper)
+    scraped, _, _, _ = multi_scraper.scrape_with_incremental_quota(daily_quota=100, **kwargs)
+    return [job['title'] for job in scraped]
+
+
+class IncrementalQuotaPaginationTest(unittest.TestCase):
+    
+    def test_page_of_seen_jobs_is_skipped(self):
+        # New postings pushed 'b' onto page 2; page 3 still has an unseen job
+        scraper = FakeScraper({1: ['a', 'b'], 2: ['b'], 3: ['c'], 4: []})
+        self.assertEqual(scrape(scraper), ['a', 'b', 'c'])
+    
+    def test_repeated_last_page_ends_the_site(self):
+        # Out-of-range page numbers keep serving the last page
+        scraper = FakeScraper({1: ['a', 'b']}, last_page=['c', 'd'])
+        self.assertEqual(scrape(scraper), ['a', 'b', 'c', 'd'])
+        self.assertLessEqual(max(scraper.fetched), 5)
+    
+    def test_seen_only_pages_in_a_row_end_the_site(self):
+        # Each page past the end repeats a different already kept card
+        pages = {1: ['a', 'b', 'c']}
+        pages.update({page: [name] for page, name in zip(range(2, 40), 'abcabcabcabcabcabcabcabcabcabcabcabcab')})
+        scraper = FakeScraper(pages)
+        self.assertEqual(scrape(scraper), ['a', 'b', 'c'])
+        self.assertLessEqual(max(scraper.fetched), 5)
+
+    
+    def test_free_jobs_do_not_lift_the_page_limit(self):
+        # Every listing is free (settled by the pre-filter): the quota never
+        # fills, so the default page limit ends the crawl
+        pages = {page: [f'job{page}'] for page in range(1, 40)}
+        scraper = FakeScraper(pages)
+        scraped = scrape(scraper, quota_cost=lambda job: False)
+        self.assertEqual(len(scraped), DEFAULT_MAX_PAGES_PER_SITE)
+
+
+if __name__ == '__main__':
+    unittest.main()